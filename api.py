@@ -4,12 +4,14 @@ Part 3: REST API for Legal Docket System
 
 Endpoints:
 - GET /cases?judge=<name>&year=<yyyy> - Filter cases by judge and/or year
-- POST /cases/search - Semantic search over docket text (delegates to rag.search_dockets)
+- POST /cases/search - Semantic search over docket text (delegates to rag.search_dockets_async)
 - GET /cases/{case_number} - Get full case details with parties
 
-Validation: Pydantic models for request/response validation
+Validation: Pydantic models validate requests; response models only document the OpenAPI schema
 Error handling: FastAPI exception handlers return {"error": "..."} JSON
-Connection pooling: Global AsyncConnectionPool (psycopg 3) created on startup, closed on shutdown
+Serialization: all responses are rendered with orjson (ORJSONResponse)
+Caching: /cases/search answers near-duplicate queries from an in-process SemanticCache
+Connection pooling: Global asyncpg pool created on startup, closed on shutdown
 
 Run: uvicorn api:app --host 0.0.0.0 --port 8000 --reload
 """
@@ -17,53 +19,122 @@ Run: uvicorn api:app --host 0.0.0.0 --port 8000 --reload
 from __future__ import annotations
 
 import os
-import asyncio
-from typing import List, Dict, Optional
-from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, AsyncIterator, List, Optional
+from contextlib import AsyncExitStack, asynccontextmanager
 
+import orjson
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, field_validator
-from psycopg_pool import AsyncConnectionPool
-from psycopg.rows import dict_row
-from psycopg import AsyncConnection
-
-from rag import search_dockets
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+import asyncpg
+from pgvector.asyncpg import register_vector
+
+from rag import (
+    EMBEDDING_COLUMN_TYPE_SQL,
+    VECTOR_DIM,
+    embed_query_async,
+    search_dockets_async,
+    search_server_settings,
+    set_embedding_type,
+)
+from sem_cache import SemanticCache
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "postgresql://postgres:postgres@db:5432/dockets")
+EMBED_WORKERS = int(os.environ.get("EMBED_WORKERS", "8"))
 
 # Global connection pool
-pool: Optional[AsyncConnectionPool] = None
+pool: Optional[asyncpg.Pool] = None
+
+# Near-duplicate /cases/search queries are answered from memory (see sem_cache.py)
+search_cache = SemanticCache(
+    dim=VECTOR_DIM,
+    capacity=int(os.environ.get("SEMANTIC_CACHE_SIZE", "1024")),
+    threshold=float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+    ttl_seconds=float(os.environ.get("SEMANTIC_CACHE_TTL", "300")),
+)
+
+
+async def init_connection(conn: asyncpg.Connection) -> None:
+    """Per-connection codecs: json via orjson, pgvector's vector/halfvec types"""
+    await conn.set_type_codec(
+        "json",
+        encoder=lambda v: orjson.dumps(v).decode(),
+        decoder=orjson.loads,
+        schema="pg_catalog",
+    )
+    await register_vector(conn)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown lifecycle"""
     global pool
-    # Startup: create connection pool
-    pool = AsyncConnectionPool(
-        conninfo=DATABASE_URL,
+    # Startup: create connection pool (asyncpg caches prepared statements per connection)
+    pool = await asyncpg.create_pool(
+        DATABASE_URL,
         min_size=2,
         max_size=10,
-        open=False,
+        statement_cache_size=100,
+        init=init_connection,
+        server_settings=search_server_settings(),
     )
-    await pool.open()
+    # Search casts the query to the embedding column's actual type (vector or halfvec)
+    set_embedding_type(await pool.fetchval(EMBEDDING_COLUMN_TYPE_SQL))
+    # Bounded thread pool for query embedding (the default executor grows with CPU count)
+    app.state.embed_executor = ThreadPoolExecutor(max_workers=EMBED_WORKERS, thread_name_prefix="embed")
     yield
     # Shutdown: close connection pool
     await pool.close()
+    app.state.embed_executor.shutdown(wait=False)
+
+
+def _record_default(obj: Any) -> Any:
+    """orjson fallback: asyncpg Records serialize as objects keyed by column name"""
+    if isinstance(obj, asyncpg.Record):
+        return dict(obj)
+    raise TypeError
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(
+        content,
+        default=_record_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (straight to UTF-8 bytes)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
 
 
 app = FastAPI(
     title="Legal Docket API",
     description="REST API for querying legal dockets with semantic search",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
-# Pydantic models
-class SearchRequest(BaseModel):
+# Pydantic models (responses are documented with these but not re-validated)
+class ApiModel(BaseModel):
+    """Base model: unknown fields dropped, no attribute lookups or assignment validation"""
+    model_config = ConfigDict(
+        extra="ignore",
+        from_attributes=False,
+        arbitrary_types_allowed=False,
+        validate_assignment=False,
+    )
+
+
+class SearchRequest(ApiModel):
     query: str = Field(..., min_length=2, description="Search query (min 2 characters)")
     limit: int = Field(5, ge=1, le=50, description="Number of results (1-50)")
+    keywords: Optional[str] = Field(None, description="Only rank chunks matching these keywords (full-text)")
 
     @field_validator("query")
     @classmethod
@@ -72,8 +143,13 @@ class SearchRequest(BaseModel):
             raise ValueError("query must be at least 2 characters")
         return v.strip()
 
+    @field_validator("keywords")
+    @classmethod
+    def validate_keywords(cls, v: Optional[str]) -> Optional[str]:
+        return (v or "").strip() or None
+
 
-class CaseSummary(BaseModel):
+class CaseSummary(ApiModel):
     case_number: str
     title: str
     filed_date: Optional[str]
@@ -81,13 +157,13 @@ class CaseSummary(BaseModel):
     court: Optional[str]
 
 
-class PartyInfo(BaseModel):
+class PartyInfo(ApiModel):
     name: str
     normalized_name: str
     role: str
 
 
-class CaseDetail(BaseModel):
+class CaseDetail(ApiModel):
     case_number: str
     title: str
     filed_date: Optional[str]
@@ -99,7 +175,7 @@ class CaseDetail(BaseModel):
     parties: List[PartyInfo]
 
 
-class SearchResult(BaseModel):
+class SearchResult(ApiModel):
     case_number: str
     title: str
     filed_date: Optional[str]
@@ -110,33 +186,66 @@ class SearchResult(BaseModel):
     best_chunk_snippet: Optional[str]
 
 
+# Build validators/serializers now rather than on first use (cold start under --reload)
+for _model in (SearchRequest, CaseSummary, PartyInfo, CaseDetail, SearchResult):
+    _model.model_rebuild(force=True)
+
+
 # Helper functions
-async def fetch_all(query: str, params: tuple = ()) -> List[Dict]:
-    """Execute query and return all rows as dicts"""
+async def fetch_all(query: str, params: tuple = ()) -> List[asyncpg.Record]:
+    """Execute query (prepared statement cached per connection) and return all rows"""
     if not pool:
         raise HTTPException(status_code=500, detail="Database pool not initialized")
-    async with pool.connection() as conn:
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(query, params)
-            rows = await cur.fetchall()
-            return [dict(row) for row in rows]
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, *params)
 
 
-async def fetch_one(query: str, params: tuple = ()) -> Optional[Dict]:
-    """Execute query and return one row as dict, or None"""
+async def fetch_one(query: str, params: tuple = ()) -> Optional[asyncpg.Record]:
+    """Execute query (prepared statement cached per connection) and return one row, or None"""
     if not pool:
         raise HTTPException(status_code=500, detail="Database pool not initialized")
-    async with pool.connection() as conn:
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(query, params)
-            row = await cur.fetchone()
-            return dict(row) if row else None
+    async with pool.acquire() as conn:
+        return await conn.fetchrow(query, *params)
+
+
+STREAM_FETCH_ROWS = 100  # rows per cursor round trip while streaming
+
+
+async def open_json_array_stream(query: str, params: tuple = ()) -> AsyncIterator[bytes]:
+    """
+    Run query and return an iterator that streams its rows as a JSON array.
+
+    The connection is acquired and the first rows fetched before returning, so a
+    database error still becomes an error response instead of a truncated 200 body.
+    """
+    async with AsyncExitStack() as stack:
+        conn = await stack.enter_async_context(pool.acquire())
+        # asyncpg cursors only live inside a transaction
+        await stack.enter_async_context(conn.transaction(readonly=True))
+        cursor = await conn.cursor(query, *params)
+        rows = await cursor.fetch(STREAM_FETCH_ROWS)
+        # The stream now owns the connection and transaction
+        stack = stack.pop_all()
+    return _json_array_rows(stack, cursor, rows)
+
+
+async def _json_array_rows(stack: AsyncExitStack, cursor, rows: List[asyncpg.Record]) -> AsyncIterator[bytes]:
+    """Encode rows one at a time (bounded memory per request); releases the connection when done"""
+    async with stack:
+        yield b"["
+        sep = b""
+        while rows:
+            for row in rows:
+                yield sep + dumps(row)
+                sep = b","
+            rows = await cursor.fetch(STREAM_FETCH_ROWS)
+        yield b"]"
 
 
 # Exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail}
     )
@@ -144,14 +253,38 @@ async def http_exception_handler(request, exc: HTTPException):
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc: Exception):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": f"Internal server error: {str(exc)}"}
     )
 
 
+# GET /cases has exactly three filter shapes; fixed SQL texts keep asyncpg's
+# per-connection statement cache hitting. Year filters are a filed_date range
+# (not EXTRACT) so the filed_date indexes can be used.
+_CASES_SELECT = """
+    SELECT 
+        c.case_number,
+        c.title,
+        c.filed_date::text as filed_date,
+        j.full_name as judge,
+        co.name as court
+    FROM cases c
+    LEFT JOIN judges j ON c.judge_id = j.id
+    LEFT JOIN courts co ON c.court_id = co.id
+    WHERE {where}
+    ORDER BY c.filed_date DESC
+    LIMIT 200
+"""
+_Q_CASES_BY_JUDGE = _CASES_SELECT.format(where="j.normalized_name = $1")
+_Q_CASES_BY_YEAR = _CASES_SELECT.format(where="c.filed_date >= $1 AND c.filed_date < $2")
+_Q_CASES_BY_JUDGE_YEAR = _CASES_SELECT.format(
+    where="j.normalized_name = $1 AND c.filed_date >= $2 AND c.filed_date < $3"
+)
+
+
 # Endpoints
-@app.get("/cases", response_model=List[CaseSummary])
+@app.get("/cases", response_model=None, responses={200: {"model": List[CaseSummary]}})
 async def list_cases(
     judge: Optional[str] = Query(None, description="Judge normalized name (exact match)"),
     year: Optional[int] = Query(None, ge=1900, le=2100, description="Year (YYYY)")
@@ -167,65 +300,53 @@ async def list_cases(
             detail="At least one of 'judge' or 'year' must be provided"
         )
     
-    conditions = []
-    params = []
-    
-    if judge:
-        conditions.append("j.normalized_name = LOWER(%s)")
-        params.append(judge.lower())
+    if judge and year:
+        query, params = _Q_CASES_BY_JUDGE_YEAR, (judge.lower(), date(year, 1, 1), date(year + 1, 1, 1))
+    elif judge:
+        query, params = _Q_CASES_BY_JUDGE, (judge.lower(),)
+    else:
+        query, params = _Q_CASES_BY_YEAR, (date(year, 1, 1), date(year + 1, 1, 1))
     
-    if year:
-        conditions.append("EXTRACT(YEAR FROM c.filed_date) = %s")
-        params.append(year)
-    
-    where_clause = " AND ".join(conditions)
-    
-    query = f"""
-        SELECT 
-            c.case_number,
-            c.title,
-            c.filed_date::text as filed_date,
-            j.full_name as judge,
-            co.name as court
-        FROM cases c
-        LEFT JOIN judges j ON c.judge_id = j.id
-        LEFT JOIN courts co ON c.court_id = co.id
-        WHERE {where_clause}
-        ORDER BY c.filed_date DESC
-        LIMIT 200
-    """
+    if not pool:
+        raise HTTPException(status_code=500, detail="Database pool not initialized")
     
-    rows = await fetch_all(query, tuple(params))
-    return [CaseSummary(**row) for row in rows]
+    stream = await open_json_array_stream(query, params)
+    return StreamingResponse(stream, media_type="application/json")
 
 
-@app.post("/cases/search", response_model=List[SearchResult])
+@app.post("/cases/search", response_model=None, responses={200: {"model": List[SearchResult]}})
 async def search_cases(request: SearchRequest):
     """
     Semantic search over docket text.
     
-    Delegates to rag.search_dockets() for vector similarity search.
+    Delegates to rag.search_dockets_async() for vector similarity search.
     """
-    # Run synchronous search_dockets in thread pool to avoid blocking
-    loop = asyncio.get_event_loop()
-    results = await loop.run_in_executor(
-        None,
-        search_dockets,
-        request.query,
-        request.limit
-    )
+    if not pool:
+        raise HTTPException(status_code=500, detail="Database pool not initialized")
+    
+    # Vector query runs on the shared async pool; only the embedding uses a thread
+    qvec = await embed_query_async(request.query, app.state.embed_executor)
     
-    return [SearchResult(**result) for result in results]
+    cache_key = (request.limit, request.keywords)
+    payload = search_cache.lookup(qvec, key=cache_key)
+    if payload is None:
+        results = await search_dockets_async(
+            request.query, request.limit, pool, qvec=qvec, keywords=request.keywords
+        )
+        payload = dumps(results)
+        search_cache.insert(qvec, payload, key=cache_key)
+    
+    return Response(content=payload, media_type="application/json")
 
 
-@app.get("/cases/{case_number}", response_model=CaseDetail)
+@app.get("/cases/{case_number}", response_model=None, responses={200: {"model": CaseDetail}})
 async def get_case(case_number: str):
     """
     Get full case details including all parties.
     
     Returns 404 if case not found.
     """
-    # Get case details
+    # Case details with parties aggregated into a JSON array (single round trip)
     case_query = """
         SELECT 
             c.case_number,
@@ -235,12 +356,25 @@ async def get_case(case_number: str):
             c.status,
             j.full_name as judge,
             co.name as court,
-            ct.name as case_type
+            ct.name as case_type,
+            COALESCE((
+                SELECT json_agg(
+                    json_build_object(
+                        'name', p.name,
+                        'normalized_name', p.normalized_name,
+                        'role', cp.role
+                    )
+                    ORDER BY cp.role, p.name
+                )
+                FROM case_parties cp
+                JOIN parties p ON cp.party_id = p.id
+                WHERE cp.case_id = c.id
+            ), '[]'::json) as parties
         FROM cases c
         LEFT JOIN judges j ON c.judge_id = j.id
         LEFT JOIN courts co ON c.court_id = co.id
         LEFT JOIN case_types ct ON c.case_type_id = ct.id
-        WHERE c.case_number = %s
+        WHERE c.case_number = $1
     """
     
     case = await fetch_one(case_query, (case_number,))
@@ -248,32 +382,13 @@ async def get_case(case_number: str):
     if not case:
         raise HTTPException(status_code=404, detail=f"Case {case_number} not found")
     
-    # Get parties
-    parties_query = """
-        SELECT 
-            p.name,
-            p.normalized_name,
-            cp.role
-        FROM case_parties cp
-        JOIN parties p ON cp.party_id = p.id
-        JOIN cases c ON cp.case_id = c.id
-        WHERE c.case_number = %s
-        ORDER BY cp.role, p.name
-    """
-    
-    parties_rows = await fetch_all(parties_query, (case_number,))
-    parties = [PartyInfo(**dict(row)) for row in parties_rows]
-    
-    case_dict = dict(case)
-    case_dict["parties"] = parties
-    
-    return CaseDetail(**case_dict)
+    return ORJSONResponse(case)
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "ok", "pool": "open" if pool and pool.get_stats() else "closed"}
+    return {"status": "ok", "pool": "open" if pool and not pool.is_closing() else "closed"}
 
 
 if __name__ == "__main__":
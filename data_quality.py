@@ -4,18 +4,31 @@ Data Quality Dashboard
 
 Generates a concise, human-readable quality report for the legal docket database.
 Supports filtering by run_id or date range.
+
+The report queries are independent, so they run concurrently on a small asyncpg
+pool (asyncio.gather): each get_* helper acquires its own connection, and the
+report takes as long as its slowest query rather than the sum of all of them.
 """
 
 import os
 import sys
+import asyncio
 import argparse
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional, Dict, List
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import asyncpg
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "postgresql://postgres:postgres@db:5432/dockets")
 
+# Connections used to run report sections in parallel (one backend per query)
+REPORT_POOL_SIZE = int(os.environ.get("REPORT_POOL_SIZE", "8"))
+
+# ingest_errors.error_kind for date parse failures (ingest.ERROR_KINDS["BAD_DATE"])
+ERROR_KIND_BAD_DATE = 1
+
+# Width of the "Recent 7 Days" bar chart, in characters
+CHART_WIDTH = 40
+
 
 def format_number(n: int) -> str:
     """Format number with commas"""
@@ -29,9 +42,9 @@ def format_percent(numerator: int, denominator: int) -> str:
     return f"{(numerator / denominator * 100):.1f}%"
 
 
-def get_connection():
-    """Get database connection"""
-    return psycopg2.connect(DATABASE_URL)
+async def get_pool() -> asyncpg.Pool:
+    """Create the connection pool the report sections share"""
+    return await asyncpg.create_pool(DATABASE_URL, min_size=1, max_size=REPORT_POOL_SIZE)
 
 
 def print_header(scope_desc: str):
@@ -49,7 +62,7 @@ def print_section(title: str):
     print(f"\n--- {title} ---")
 
 
-def get_scope_description(run_id: Optional[int], since: Optional[str]) -> str:
+def get_scope_description(run_id: Optional[int], since: Optional[date]) -> str:
     """Generate scope description"""
     if run_id:
         return f"run_id={run_id}"
@@ -59,252 +72,241 @@ def get_scope_description(run_id: Optional[int], since: Optional[str]) -> str:
         return "all-time (lifetime aggregates)"
 
 
-def get_volume_summary(conn, run_id: Optional[int]) -> Dict:
+async def get_volume_summary(pool: asyncpg.Pool, run_id: Optional[int]) -> Optional[Dict]:
     """Get volume summary from ingest_runs"""
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        if run_id:
-            cur.execute("""
-                SELECT 
-                    total_read as total_records,
-                    total_inserted as inserted,
-                    total_updated as updated,
-                    total_failed as failed,
-                    0 as warnings
-                FROM ingest_runs
-                WHERE run_id = %s
-            """, (run_id,))
-            row = cur.fetchone()
-            if not row:
-                return None
-            return dict(row)
-        else:
-            cur.execute("""
-                SELECT 
-                    SUM(total_read) as total_records,
-                    SUM(total_inserted) as inserted,
-                    SUM(total_updated) as updated,
-                    SUM(total_failed) as failed,
-                    0 as warnings
-                FROM ingest_runs
-            """)
-            row = cur.fetchone()
-            return dict(row) if row else {
-                "total_records": 0, "inserted": 0, "updated": 0, "failed": 0, "warnings": 0
-            }
-
-
-def get_error_breakdown(conn, run_id: Optional[int], since: Optional[str]) -> List[Dict]:
-    """Get top 10 error codes with counts"""
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        if run_id:
-            cur.execute("""
-                SELECT 
-                    error_code,
-                    COUNT(*) AS cnt,
-                    MAX(last_seen_at) AS most_recent
-                FROM ingest_errors
-                WHERE run_id = %s
-                GROUP BY error_code
-                ORDER BY cnt DESC
-                LIMIT 10
-            """, (run_id,))
-        elif since:
-            cur.execute("""
-                SELECT 
-                    e.error_code,
-                    COUNT(*) AS cnt,
-                    MAX(e.last_seen_at) AS most_recent
-                FROM ingest_errors e
-                JOIN ingest_runs r ON e.run_id = r.run_id
-                WHERE r.started_at >= %s::date
-                GROUP BY e.error_code
-                ORDER BY cnt DESC
-                LIMIT 10
-            """, (since,))
-        else:
-            cur.execute("""
-                SELECT 
-                    error_code,
-                    COUNT(*) AS cnt,
-                    MAX(last_seen_at) AS most_recent
-                FROM ingest_errors
-                GROUP BY error_code
-                ORDER BY cnt DESC
-                LIMIT 10
-            """)
-        return [dict(row) for row in cur.fetchall()]
-
-
-def get_completeness(conn, since: Optional[str]) -> Dict:
-    """Get completeness checks for cases"""
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        if since:
-            cur.execute("""
-                SELECT
-                    COUNT(*) AS total,
-                    COUNT(*) FILTER (WHERE judge_id IS NULL) AS no_judge,
-                    COUNT(*) FILTER (WHERE court_id IS NULL) AS no_court,
-                    COUNT(*) FILTER (WHERE case_type_id IS NULL) AS no_case_type,
-                    COUNT(*) FILTER (WHERE COALESCE(NULLIF(docket_text, ''), NULL) IS NULL) AS no_docket
-                FROM cases
-                WHERE filed_date >= %s::date
-            """, (since,))
-        else:
-            cur.execute("""
-                SELECT
-                    COUNT(*) AS total,
-                    COUNT(*) FILTER (WHERE judge_id IS NULL) AS no_judge,
-                    COUNT(*) FILTER (WHERE court_id IS NULL) AS no_court,
-                    COUNT(*) FILTER (WHERE case_type_id IS NULL) AS no_case_type,
-                    COUNT(*) FILTER (WHERE COALESCE(NULLIF(docket_text, ''), NULL) IS NULL) AS no_docket
-                FROM cases
-            """)
-        row = cur.fetchone()
-        return dict(row) if row else {
-            "total": 0, "no_judge": 0, "no_court": 0, "no_case_type": 0, "no_docket": 0
-        }
-
-
-def get_date_sanity(conn, run_id: Optional[int], since: Optional[str]) -> Dict:
-    """Get date sanity checks"""
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        # Get min/max filed_date
-        if since:
-            cur.execute("""
-                SELECT MIN(filed_date) AS min_date, MAX(filed_date) AS max_date
-                FROM cases
-                WHERE filed_date >= %s::date
-            """, (since,))
-        else:
-            cur.execute("""
-                SELECT MIN(filed_date) AS min_date, MAX(filed_date) AS max_date
-                FROM cases
-            """)
-        date_row = cur.fetchone()
-        min_date = date_row["min_date"] if date_row and date_row["min_date"] else None
-        max_date = date_row["max_date"] if date_row and date_row["max_date"] else None
-        
-        # Get bad dates count
-        if run_id:
-            cur.execute("""
-                SELECT COUNT(*) AS bad_dates
-                FROM ingest_errors
-                WHERE run_id = %s
-                  AND error_code LIKE 'filed_date parse failed%'
-            """, (run_id,))
-        elif since:
-            cur.execute("""
-                SELECT COUNT(*) AS bad_dates
-                FROM ingest_errors e
-                JOIN ingest_runs r ON e.run_id = r.run_id
-                WHERE r.started_at >= %s::date
-                  AND e.error_code LIKE 'filed_date parse failed%'
-            """, (since,))
-        else:
-            cur.execute("""
-                SELECT COUNT(*) AS bad_dates
-                FROM ingest_errors
-                WHERE error_code LIKE 'filed_date parse failed%'
-            """)
-        bad_row = cur.fetchone()
-        bad_dates = bad_row["bad_dates"] if bad_row else 0
-        
-        return {
-            "min_date": min_date,
-            "max_date": max_date,
-            "bad_dates": bad_dates
-        }
-
-
-def get_entity_normalization(conn) -> Dict:
-    """Get entity normalization sanity checks"""
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        # Judges (uses full_name, not name)
-        cur.execute("""
+    if run_id:
+        return await pool.fetchrow("""
             SELECT 
-                COUNT(DISTINCT full_name) AS distinct_names,
-                COUNT(DISTINCT normalized_name) AS distinct_normalized,
-                COUNT(*) AS total
-            FROM judges
-        """)
-        judges_row = cur.fetchone()
-        
-        # Courts (uses name)
-        cur.execute("""
+                total_read as total_records,
+                total_inserted as inserted,
+                total_updated as updated,
+                total_failed as failed,
+                0 as warnings
+            FROM ingest_runs
+            WHERE run_id = $1
+        """, run_id)
+    else:
+        row = await pool.fetchrow("""
             SELECT 
-                COUNT(DISTINCT name) AS distinct_names,
-                COUNT(DISTINCT normalized_name) AS distinct_normalized,
-                COUNT(*) AS total
-            FROM courts
+                SUM(total_read) as total_records,
+                SUM(total_inserted) as inserted,
+                SUM(total_updated) as updated,
+                SUM(total_failed) as failed,
+                0 as warnings
+            FROM ingest_runs
         """)
-        courts_row = cur.fetchone()
-        
-        return {
-            "judges": dict(judges_row) if judges_row else {"distinct_names": 0, "distinct_normalized": 0, "total": 0},
-            "courts": dict(courts_row) if courts_row else {"distinct_names": 0, "distinct_normalized": 0, "total": 0}
+        return row or {
+            "total_records": 0, "inserted": 0, "updated": 0, "failed": 0, "warnings": 0
         }
 
 
-def get_parties_coverage(conn, since: Optional[str]) -> Dict:
-    """Get parties coverage statistics"""
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        if since:
-            cur.execute("""
-                WITH per_case AS (
-                    SELECT c.case_number,
-                        BOOL_OR(cp.role = 'plaintiff') AS has_plaintiff,
-                        BOOL_OR(cp.role = 'defendant') AS has_defendant
-                    FROM case_parties cp
-                    JOIN cases c ON cp.case_id = c.id
-                    WHERE c.filed_date >= %s::date
-                    GROUP BY c.case_number
-                )
-                SELECT
-                    COUNT(*) AS cases_with_parties,
-                    COUNT(*) FILTER (WHERE has_plaintiff) AS cases_with_plaintiff,
-                    COUNT(*) FILTER (WHERE has_defendant) AS cases_with_defendant
-                FROM per_case
-            """, (since,))
-        else:
-            cur.execute("""
-                WITH per_case AS (
-                    SELECT c.case_number,
-                        BOOL_OR(cp.role = 'plaintiff') AS has_plaintiff,
-                        BOOL_OR(cp.role = 'defendant') AS has_defendant
-                    FROM case_parties cp
-                    JOIN cases c ON cp.case_id = c.id
-                    GROUP BY c.case_number
-                )
-                SELECT
-                    COUNT(*) AS cases_with_parties,
-                    COUNT(*) FILTER (WHERE has_plaintiff) AS cases_with_plaintiff,
-                    COUNT(*) FILTER (WHERE has_defendant) AS cases_with_defendant
-                FROM per_case
-            """)
-        coverage_row = cur.fetchone()
-        
-        # Get top 10 roles
-        cur.execute("""
-            SELECT role, COUNT(*) AS cnt
-            FROM case_parties
-            GROUP BY role
+async def get_error_breakdown(pool: asyncpg.Pool, run_id: Optional[int], since: Optional[date]) -> List[Dict]:
+    """Get top 10 error codes with counts"""
+    if run_id:
+        return await pool.fetch("""
+            SELECT 
+                error_code,
+                COUNT(*) AS cnt,
+                MAX(last_seen_at) AS most_recent
+            FROM ingest_errors
+            WHERE run_id = $1
+            GROUP BY error_code
+            ORDER BY cnt DESC
+            LIMIT 10
+        """, run_id)
+    elif since:
+        return await pool.fetch("""
+            SELECT 
+                e.error_code,
+                COUNT(*) AS cnt,
+                MAX(e.last_seen_at) AS most_recent
+            FROM ingest_errors e
+            JOIN ingest_runs r ON e.run_id = r.run_id
+            WHERE r.started_at >= $1::date
+            GROUP BY e.error_code
+            ORDER BY cnt DESC
+            LIMIT 10
+        """, since)
+    else:
+        return await pool.fetch("""
+            SELECT 
+                error_code,
+                COUNT(*) AS cnt,
+                MAX(last_seen_at) AS most_recent
+            FROM ingest_errors
+            GROUP BY error_code
             ORDER BY cnt DESC
             LIMIT 10
         """)
-        roles = [dict(row) for row in cur.fetchall()]
-        
-        return {
-            "coverage": dict(coverage_row) if coverage_row else {
-                "cases_with_parties": 0, "cases_with_plaintiff": 0, "cases_with_defendant": 0
-            },
-            "roles": roles
-        }
 
 
-def get_recent_7_days(conn) -> List[Dict]:
-    """Get daily statistics for last 7 days"""
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute("""
+async def get_completeness(pool: asyncpg.Pool, since: Optional[date]) -> Dict:
+    """Get completeness checks for cases"""
+    if since:
+        row = await pool.fetchrow("""
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE judge_id IS NULL) AS no_judge,
+                COUNT(*) FILTER (WHERE court_id IS NULL) AS no_court,
+                COUNT(*) FILTER (WHERE case_type_id IS NULL) AS no_case_type,
+                COUNT(*) FILTER (WHERE COALESCE(NULLIF(docket_text, ''), NULL) IS NULL) AS no_docket
+            FROM cases
+            WHERE filed_date >= $1::date
+        """, since)
+    else:
+        row = await pool.fetchrow("""
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE judge_id IS NULL) AS no_judge,
+                COUNT(*) FILTER (WHERE court_id IS NULL) AS no_court,
+                COUNT(*) FILTER (WHERE case_type_id IS NULL) AS no_case_type,
+                COUNT(*) FILTER (WHERE COALESCE(NULLIF(docket_text, ''), NULL) IS NULL) AS no_docket
+            FROM cases
+        """)
+    return row or {
+        "total": 0, "no_judge": 0, "no_court": 0, "no_case_type": 0, "no_docket": 0
+    }
+
+
+async def get_date_sanity(pool: asyncpg.Pool, run_id: Optional[int], since: Optional[date]) -> Dict:
+    """Get date sanity checks"""
+    # Get min/max filed_date
+    if since:
+        date_query = pool.fetchrow("""
+            SELECT MIN(filed_date) AS min_date, MAX(filed_date) AS max_date
+            FROM cases
+            WHERE filed_date >= $1::date
+        """, since)
+    else:
+        date_query = pool.fetchrow("""
+            SELECT MIN(filed_date) AS min_date, MAX(filed_date) AS max_date
+            FROM cases
+        """)
+    
+    # Get bad dates count
+    if run_id:
+        bad_query = pool.fetchrow("""
+            SELECT COUNT(*) AS bad_dates
+            FROM ingest_errors
+            WHERE error_kind = $1
+              AND run_id = $2
+        """, ERROR_KIND_BAD_DATE, run_id)
+    elif since:
+        bad_query = pool.fetchrow("""
+            SELECT COUNT(*) AS bad_dates
+            FROM ingest_errors e
+            JOIN ingest_runs r ON e.run_id = r.run_id
+            WHERE e.error_kind = $1
+              AND r.started_at >= $2::date
+        """, ERROR_KIND_BAD_DATE, since)
+    else:
+        bad_query = pool.fetchrow("""
+            SELECT COUNT(*) AS bad_dates
+            FROM ingest_errors
+            WHERE error_kind = $1
+        """, ERROR_KIND_BAD_DATE)
+    
+    date_row, bad_row = await asyncio.gather(date_query, bad_query)
+    return {
+        "min_date": date_row["min_date"] if date_row and date_row["min_date"] else None,
+        "max_date": date_row["max_date"] if date_row and date_row["max_date"] else None,
+        "bad_dates": bad_row["bad_dates"] if bad_row else 0
+    }
+
+
+# Same aggregates as the entity_norm_stats view (schema.sql), for databases created before it
+ENTITY_NORM_STATS_LIVE_SQL = """
+    SELECT 'judges' AS entity, COUNT(DISTINCT full_name) AS distinct_names,
+           COUNT(normalized_name) AS distinct_normalized, COUNT(*) AS total
+    FROM judges
+    UNION ALL
+    SELECT 'courts' AS entity, COUNT(name) AS distinct_names,
+           COUNT(normalized_name) AS distinct_normalized, COUNT(*) AS total
+    FROM courts
+"""
+
+
+async def get_entity_normalization(pool: asyncpg.Pool) -> Dict:
+    """Get entity normalization sanity checks (precomputed in entity_norm_stats)"""
+    try:
+        rows = await pool.fetch("""
+            SELECT entity, distinct_names, distinct_normalized, total
+            FROM entity_norm_stats
+        """)
+    except asyncpg.UndefinedTableError:
+        # View not created yet (schema.sql not re-applied): aggregate live
+        rows = await pool.fetch(ENTITY_NORM_STATS_LIVE_SQL)
+    stats = {row["entity"]: row for row in rows}
+    empty = {"distinct_names": 0, "distinct_normalized": 0, "total": 0}
+    return {
+        "judges": stats.get("judges", empty),
+        "courts": stats.get("courts", empty)
+    }
+
+
+async def get_parties_coverage(pool: asyncpg.Pool, since: Optional[date]) -> Dict:
+    """Get parties coverage statistics"""
+    if since:
+        coverage_query = pool.fetchrow("""
+            WITH per_case AS (
+                SELECT c.case_number,
+                    BOOL_OR(cp.role = 'plaintiff') AS has_plaintiff,
+                    BOOL_OR(cp.role = 'defendant') AS has_defendant
+                FROM case_parties cp
+                JOIN cases c ON cp.case_id = c.id
+                WHERE c.filed_date >= $1::date
+                GROUP BY c.case_number
+            )
+            SELECT
+                COUNT(*) AS cases_with_parties,
+                COUNT(*) FILTER (WHERE has_plaintiff) AS cases_with_plaintiff,
+                COUNT(*) FILTER (WHERE has_defendant) AS cases_with_defendant
+            FROM per_case
+        """, since)
+    else:
+        coverage_query = pool.fetchrow("""
+            WITH per_case AS (
+                SELECT c.case_number,
+                    BOOL_OR(cp.role = 'plaintiff') AS has_plaintiff,
+                    BOOL_OR(cp.role = 'defendant') AS has_defendant
+                FROM case_parties cp
+                JOIN cases c ON cp.case_id = c.id
+                GROUP BY c.case_number
+            )
+            SELECT
+                COUNT(*) AS cases_with_parties,
+                COUNT(*) FILTER (WHERE has_plaintiff) AS cases_with_plaintiff,
+                COUNT(*) FILTER (WHERE has_defendant) AS cases_with_defendant
+            FROM per_case
+        """)
+    
+    # Get top 10 roles
+    roles_query = pool.fetch("""
+        SELECT role, COUNT(*) AS cnt
+        FROM case_parties
+        GROUP BY role
+        ORDER BY cnt DESC
+        LIMIT 10
+    """)
+    
+    coverage, roles = await asyncio.gather(coverage_query, roles_query)
+    return {
+        "coverage": coverage or {
+            "cases_with_parties": 0, "cases_with_plaintiff": 0, "cases_with_defendant": 0
+        },
+        "roles": roles
+    }
+
+
+async def get_recent_7_days(pool: asyncpg.Pool) -> List[Dict]:
+    """Get daily statistics for last 7 days, with each day's chart bar width (NULL if no data)"""
+    return await pool.fetch("""
+        SELECT 
+            day,
+            ingested,
+            failed,
+            FLOOR($1::float8 * ingested / NULLIF(MAX(ingested) OVER (), 0))::int AS bar_width
+        FROM (
             SELECT 
                 DATE(r.started_at) AS day,
                 SUM(r.total_read) AS ingested,
@@ -312,38 +314,53 @@ def get_recent_7_days(conn) -> List[Dict]:
             FROM ingest_runs r
             WHERE r.started_at >= CURRENT_DATE - INTERVAL '7 days'
             GROUP BY DATE(r.started_at)
-            ORDER BY day DESC
-        """)
-        return [dict(row) for row in cur.fetchall()]
+        ) t
+        ORDER BY day DESC
+    """, CHART_WIDTH)
+
+
+async def collect_report_data(pool: asyncpg.Pool, run_id: Optional[int], since: Optional[date]) -> Dict:
+    """Run every report query concurrently and return the results by section"""
+    pending = {
+        "volume": get_volume_summary(pool, run_id),
+        "errors": get_error_breakdown(pool, run_id, since),
+        "completeness": get_completeness(pool, since),
+        "date_sanity": get_date_sanity(pool, run_id, since),
+        "norm": get_entity_normalization(pool),
+        "parties": get_parties_coverage(pool, since),
+    }
+    if not run_id:
+        pending["recent"] = get_recent_7_days(pool)
+    
+    results = await asyncio.gather(*pending.values())
+    return dict(zip(pending, results))
 
 
-def print_ascii_bar(value: int, max_value: int, width: int = 40) -> str:
-    """Generate ASCII bar for sparkline"""
-    if max_value == 0:
+def print_ascii_bar(filled: Optional[int], width: int = CHART_WIDTH) -> str:
+    """Generate ASCII bar for sparkline (filled is computed in SQL; None means no scale)"""
+    if filled is None:
         return " " * width
-    filled = int((value / max_value) * width)
     return "█" * filled + "░" * (width - filled)
 
 
-def generate_report(run_id: Optional[int], since: Optional[str]):
+async def generate_report(run_id: Optional[int], since: Optional[date]):
     """Generate and print the data quality report"""
-    conn = get_connection()
+    pool = await get_pool()
     
     try:
         scope_desc = get_scope_description(run_id, since)
         print_header(scope_desc)
         
-        # Check if run_id exists
-        if run_id:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("SELECT 1 FROM ingest_runs WHERE run_id = %s", (run_id,))
-                if not cur.fetchone():
-                    print(f"ERROR: Run ID {run_id} not found")
-                    sys.exit(1)
+        data = await collect_report_data(pool, run_id, since)
+        
+        # The run-scoped volume query doubles as the run_id existence check
+        if run_id and not data["volume"]:
+            print(f"ERROR: Run ID {run_id} not found")
+            sys.exit(1)
         
         # Volume Summary
         print_section("Volume Summary")
-        volume = get_volume_summary(conn, run_id)
+        volume = data["volume"]
         if volume:
             total = volume["total_records"] or 0
             print(f"Total Records:     {format_number(total)}")
@@ -358,7 +375,7 @@ def generate_report(run_id: Optional[int], since: Optional[str]):
         
         # Error Breakdown
         print_section("Error Breakdown (Top 10)")
-        errors = get_error_breakdown(conn, run_id, since)
+        errors = data["errors"]
         if errors:
             total_errors = sum(e["cnt"] for e in errors)
             print(f"{'Error Code':<40} {'Count':>12} {'%':>8} {'Most Recent':<20}")
@@ -372,7 +389,7 @@ def generate_report(run_id: Optional[int], since: Optional[str]):
         
         # Completeness Checks
         print_section("Completeness Checks (Cases)")
-        completeness = get_completeness(conn, since)
+        completeness = data["completeness"]
         total = completeness["total"] or 0
         if total > 0:
             print(f"Total Cases:      {format_number(total)}")
@@ -385,7 +402,7 @@ def generate_report(run_id: Optional[int], since: Optional[str]):
         
         # Date Sanity
         print_section("Date Sanity")
-        date_sanity = get_date_sanity(conn, run_id, since)
+        date_sanity = data["date_sanity"]
         if date_sanity["min_date"]:
             print(f"Min Filed Date:   {date_sanity['min_date']}")
             print(f"Max Filed Date:   {date_sanity['max_date']}")
@@ -394,7 +411,6 @@ def generate_report(run_id: Optional[int], since: Optional[str]):
         
         if run_id or since:
             # Get total cases for bad date percentage
-            completeness = get_completeness(conn, since)
             total_cases = completeness["total"] or 0
             if total_cases > 0:
                 bad_pct = format_percent(date_sanity["bad_dates"], total_cases)
@@ -402,8 +418,7 @@ def generate_report(run_id: Optional[int], since: Optional[str]):
             else:
                 print(f"Invalid Dates:    {format_number(date_sanity['bad_dates'])}")
         else:
-            # For all-time, use total from ingest_runs
-            volume = get_volume_summary(conn, None)
+            # For all-time, use total from ingest_runs (volume is unscoped here)
             total_records = volume["total_records"] or 0
             if total_records > 0:
                 bad_pct = format_percent(date_sanity["bad_dates"], total_records)
@@ -413,7 +428,7 @@ def generate_report(run_id: Optional[int], since: Optional[str]):
         
         # Entity Normalization
         print_section("Entity Normalization Sanity")
-        norm = get_entity_normalization(conn)
+        norm = data["norm"]
         print("Judges:")
         print(f"  Distinct Names:        {format_number(norm['judges']['distinct_names'])}")
         print(f"  Distinct Normalized:    {format_number(norm['judges']['distinct_normalized'])}")
@@ -425,7 +440,7 @@ def generate_report(run_id: Optional[int], since: Optional[str]):
         
         # Parties Coverage
         print_section("Parties Coverage")
-        parties = get_parties_coverage(conn, since)
+        parties = data["parties"]
         coverage = parties["coverage"]
         total_with_parties = coverage["cases_with_parties"] or 0
         if total_with_parties > 0:
@@ -447,28 +462,25 @@ def generate_report(run_id: Optional[int], since: Optional[str]):
         # Recent 7 Days (only if no run_id)
         if not run_id:
             print_section("Recent 7 Days")
-            recent = get_recent_7_days(conn)
+            recent = data["recent"]
             if recent:
-                max_ingested = max((r["ingested"] or 0) for r in recent) if recent else 1
                 print(f"{'Date':<12} {'Ingested':>12} {'Failed':>12} {'Chart':<40}")
                 print("-" * 76)
                 for day in recent:
                     ingested = day["ingested"] or 0
                     failed = day["failed"] or 0
-                    bar = print_ascii_bar(ingested, max_ingested)
-                    print(f"{day['day']:<12} {format_number(ingested):>12} {format_number(failed):>12} {bar}")
+                    bar = print_ascii_bar(day["bar_width"])
+                    print(f"{str(day['day']):<12} {format_number(ingested):>12} {format_number(failed):>12} {bar}")
             else:
                 print("No data for last 7 days")
         
         # Check exit conditions
         exit_code = 0
-        volume = get_volume_summary(conn, run_id)
         if volume and volume["total_records"]:
             failed_pct = (volume["failed"] or 0) / volume["total_records"] * 100
             if failed_pct > 5:
                 exit_code = 1
         
-        completeness = get_completeness(conn, since)
         total = completeness["total"] or 0
         if total > 0:
             missing_judge_pct = (completeness["no_judge"] or 0) / total * 100
@@ -481,7 +493,7 @@ def generate_report(run_id: Optional[int], since: Optional[str]):
         return exit_code
         
     finally:
-        conn.close()
+        await pool.close()
 
 
 def main():
@@ -492,15 +504,16 @@ def main():
     
     args = parser.parse_args()
     
-    # Validate --since format
+    # Validate --since format (parsed once; the queries take a date)
+    since = None
     if args.since:
         try:
-            datetime.strptime(args.since, "%Y-%m-%d")
+            since = datetime.strptime(args.since, "%Y-%m-%d").date()
         except ValueError:
             print(f"ERROR: Invalid date format for --since. Use YYYY-MM-DD")
             sys.exit(1)
     
-    exit_code = generate_report(args.run_id, args.since)
+    exit_code = asyncio.run(generate_report(args.run_id, since))
     sys.exit(exit_code)
 
 
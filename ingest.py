@@ -13,15 +13,23 @@ This script:
 import json
 import re
 import logging
-import hashlib
+import io
 import os
 import pathlib
+import queue
+import threading
+import itertools
+import multiprocessing
+import functools
+import blake3
+import ijson
+import orjson
 import psycopg2
 from psycopg2.extras import execute_values
-from psycopg2 import sql
+from psycopg2 import errors, sql
 from datetime import datetime, date
-from typing import Dict, List, Tuple, Optional, Set
-from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple, Optional, Set
+from collections import Counter, defaultdict
 
 # Configure logging
 logging.basicConfig(
@@ -36,17 +44,501 @@ logger = logging.getLogger(__name__)
 
 # Quarantine directory for failed records
 QUARANTINE_DIR = os.environ.get("QUARANTINE_DIR", "quarantine")
+QUARANTINE_BUFFER_SIZE = 1 << 20  # bytes buffered before quarantine records hit the file
+
+# Number of distinct cases upserted per execute_values round trip
+BATCH_SIZE = int(os.environ.get("INGEST_BATCH_SIZE", "1000"))
+
+# Max validated records waiting for the writer thread (backpressure on the parser)
+PIPELINE_QUEUE_SIZE = int(os.environ.get("INGEST_QUEUE_SIZE", "4096"))
+
+# Processes running validate_docket, and records sent to a worker per task
+def _available_cpus() -> int:
+    """CPUs this process may run on (affinity/cpuset aware where the OS supports it)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+INGEST_WORKERS = int(os.environ.get("INGEST_WORKERS", str(_available_cpus())))
+VALIDATE_CHUNKSIZE = 256
+
+# Records read from the input per round of validation (bounds memory while streaming)
+VALIDATE_WINDOW = VALIDATE_CHUNKSIZE * max(INGEST_WORKERS, 1) * 4
+
+# Server-side prepared statements for the per-entity lookups, created once per
+# connection so cache misses skip parse/plan (run as EXECUTE name (args))
+PREPARED_STATEMENTS = {
+    "court_sel": "SELECT id FROM courts WHERE normalized_name = $1",
+    "court_ins": "INSERT INTO courts (name, normalized_name) VALUES ($1, $2) RETURNING id",
+    "judge_sel": "SELECT id FROM judges WHERE normalized_name = $1",
+    "judge_ins": "INSERT INTO judges (full_name, normalized_name) VALUES ($1, $2) RETURNING id",
+    "case_type_sel": "SELECT id FROM case_types WHERE name = $1",
+    "case_type_ins": "INSERT INTO case_types (name) VALUES ($1) RETURNING id",
+}
+
+# Parties missing from parties_cache are created once per batch (resolve_parties);
+# the no-op update makes RETURNING include parties that already exist
+UPSERT_PARTIES_SQL = """
+    INSERT INTO parties (name, normalized_name)
+    VALUES %s
+    ON CONFLICT (normalized_name) DO UPDATE
+        SET normalized_name = EXCLUDED.normalized_name
+    RETURNING normalized_name, id
+"""
+
+# Lookup caches loaded in one query each at run start (INGEST_WARM_CACHES=0 disables,
+# e.g. when the parties table is too large to hold in memory): cache attribute -> query
+WARM_CACHES = os.environ.get("INGEST_WARM_CACHES", "1") != "0"
+WARM_CACHE_SQL = {
+    "courts_cache": "SELECT normalized_name, id FROM courts",
+    "judges_cache": "SELECT normalized_name, id FROM judges",
+    "case_types_cache": "SELECT name, id FROM case_types",
+    "parties_cache": "SELECT normalized_name, id FROM parties",
+}
+
+CASE_COLUMNS = "case_number, court_id, title, filed_date, case_type_id, judge_id, docket_text, status"
+
+_UPSERT_CASES_CONFLICT = """
+    ON CONFLICT (case_number) DO UPDATE
+        SET court_id = EXCLUDED.court_id,
+            title = EXCLUDED.title,
+            filed_date = EXCLUDED.filed_date,
+            case_type_id = EXCLUDED.case_type_id,
+            judge_id = EXCLUDED.judge_id,
+            docket_text = EXCLUDED.docket_text,
+            status = EXCLUDED.status,
+            updated_at = now()
+    RETURNING case_number, id, (xmax = 0) AS inserted
+"""
+
+UPSERT_CASES_SQL = f"""
+    INSERT INTO cases ({CASE_COLUMNS})
+    VALUES %s""" + _UPSERT_CASES_CONFLICT
+
+# Name variations are counted in memory and written once per batch:
+# kind -> (table, id column)
+VARIATION_TABLES = {
+    "court": ("court_name_variations", "court_id"),
+    "judge": ("judge_name_variations", "judge_id"),
+    "party": ("party_name_variations", "party_id"),
+}
+
+UPSERT_VARIATIONS_SQL = {
+    kind: f"""
+        INSERT INTO {table} ({id_column}, raw_name, seen_count)
+        VALUES %s
+        ON CONFLICT ({id_column}, raw_name) DO UPDATE
+            SET last_seen_at = now(),
+                seen_count = {table}.seen_count + EXCLUDED.seen_count
+    """
+    for kind, (table, id_column) in VARIATION_TABLES.items()
+}
+
+INSERT_CASE_PARTIES_SQL = """
+    INSERT INTO case_parties (case_id, party_id, role)
+    VALUES %s
+    ON CONFLICT (case_id, party_id, role) DO NOTHING
+"""
+
+# Large batches are COPYed into session temp tables (emptied at each commit) and
+# upserted from there, which skips per-row INSERT overhead on cold loads
+COPY_MIN_ROWS = int(os.environ.get("INGEST_COPY_MIN_ROWS", "100"))
+
+STAGING_TABLES_SQL = f"""
+    CREATE TEMP TABLE IF NOT EXISTS cases_staging ON COMMIT DELETE ROWS AS
+        SELECT {CASE_COLUMNS} FROM cases WITH NO DATA;
+    CREATE TEMP TABLE IF NOT EXISTS case_parties_staging ON COMMIT DELETE ROWS AS
+        SELECT case_id, party_id, role FROM case_parties WITH NO DATA;
+"""
+
+UPSERT_CASES_FROM_STAGING_SQL = f"""
+    INSERT INTO cases ({CASE_COLUMNS})
+    SELECT {CASE_COLUMNS} FROM cases_staging""" + _UPSERT_CASES_CONFLICT
+
+INSERT_CASE_PARTIES_FROM_STAGING_SQL = """
+    INSERT INTO case_parties (case_id, party_id, role)
+    SELECT case_id, party_id, role FROM case_parties_staging
+    ON CONFLICT (case_id, party_id, role) DO NOTHING
+"""
+
+# COPY text format: backslash escapes for the delimiter/row separators, \N for NULL
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+# error_code -> ingest_errors.error_kind (indexed smallint used by data_quality.py)
+ERROR_KINDS = {
+    "UNKNOWN": 0,
+    "BAD_DATE": 1,
+    "MISSING_CASE_NUMBER": 2,
+    "STATUS_UNMAPPED": 3,
+    "FK_COURT": 4,
+    "FK_CASE_TYPE": 5,
+    "FK_JUDGE": 6,
+    "VALIDATION_ERROR": 7,
+}
 
 
 # Utility functions for error tracking
-def canonical_json(obj: dict) -> str:
-    """Convert dict to canonical JSON string for hashing"""
-    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+def canonical_json(obj: dict) -> bytes:
+    """Convert dict to canonical JSON (compact, sorted keys, UTF-8 bytes) for hashing"""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+
+def record_hash_hex(b: bytes) -> str:
+    """Compute the BLAKE3 hash of bytes as hex (32-byte digest, same width as SHA256)"""
+    return blake3.blake3(b).hexdigest(length=32)
+
+
+# Characters dropped from court names: periods and every character \s matches
+# (str.isspace(); U+3000 is the highest), deleted with str.translate
+_COURT_STRIP_TABLE = str.maketrans('', '', '.' + ''.join(chr(c) for c in range(0x3001) if chr(c).isspace()))
+
+# Patterns for the parsing/normalization functions below, compiled once
+_JUDGE_TITLE_RE = re.compile(r'^(hon\.?|judge|justice)\s+', re.IGNORECASE)
+# Numeric dates in one pass: ISO YYYY-M-D (y1/m1/d1) or MDY M-D-YYYY / M/D/YYYY (m2/d2/y2)
+_DATE_NUMERIC_RE = re.compile(
+    r'^\s*(?:(?P<y1>\d{4})-(?P<m1>\d{1,2})-(?P<d1>\d{1,2})'
+    r'|(?P<m2>\d{1,2})[-/](?P<d2>\d{1,2})[-/](?P<y2>\d{4}))\s*$'
+)
+_DATE_NAMED_RE = re.compile(r'^([A-Za-z]+)\s+(\d{1,2}),\s+(\d{4})$')
+_PARTIES_SPLIT_RE = re.compile(r'[;/]')
+_ROLE_RE = re.compile(r'\((plaintiff|defendant|plaintiffs|defendants|third_party|intervenor|other)\)', re.IGNORECASE)
+_PAREN_RE = re.compile(r'\([^)]+\)')
+
+
+def copy_text(rows: List[Tuple]) -> io.StringIO:
+    """Render rows as a COPY ... FROM STDIN (text format) buffer"""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join("\\N" if v is None else str(v).translate(_COPY_ESCAPES) for v in row))
+        buf.write("\n")
+    buf.seek(0)
+    return buf
+
+
+# Month names and abbreviations accepted by parse_date (lowercase)
+_MONTH_NAMES = ["january", "february", "march", "april", "may", "june", "july",
+                "august", "september", "october", "november", "december"]
+_MONTHS = {
+    **{name: number for number, name in enumerate(_MONTH_NAMES, 1)},
+    **{name[:3]: number for number, name in enumerate(_MONTH_NAMES, 1)},
+}
+
+
+# Cap for the memoized parsers below; court/judge/party strings repeat heavily across dockets
+PARSE_CACHE_SIZE = 65536
+
+
+# Parsing/normalization (module level and side-effect free, so worker processes can run them)
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def normalize_court_name(court: str) -> str:
+    """
+    Normalize court name to handle variations
+    
+    Examples:
+    - "S.D.N.Y" -> "SDNY"
+    - "S.D.N.Y." -> "SDNY"
+    - "N.D. Cal." -> "NDCAL"
+    """
+    if not court:
+        return ""
+    
+    # Remove periods, spaces, convert to uppercase
+    return court.upper().translate(_COURT_STRIP_TABLE)
 
 
-def sha256_hex(s: str) -> str:
-    """Compute SHA256 hash of string as hex"""
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def normalize_judge_name(judge: str) -> str:
+    """
+    Normalize judge name by removing titles and extra whitespace
+    
+    Examples:
+    - "Hon. Maria Rodriguez" -> "maria rodriguez"
+    - "Judge Sarah Chen" -> "sarah chen"
+    """
+    if not judge:
+        return ""
+    
+    # Remove common titles
+    normalized = _JUDGE_TITLE_RE.sub('', judge)
+    # Normalize whitespace and convert to lowercase
+    normalized = ' '.join(normalized.split()).lower()
+    return normalized
+
+
+def normalize_party_name(party: str) -> str:
+    """
+    Normalize party name for matching variations
+    
+    Examples:
+    - "Acme Corp" -> "acme corp"
+    - "Acme Corporation" -> "acme corporation" (kept separate for now)
+    """
+    if not party:
+        return ""
+    
+    # Remove extra whitespace, convert to lowercase
+    normalized = ' '.join(party.split()).lower().strip()
+    return normalized
+
+
+def parse_date(date_str: str) -> date:
+    """
+    Parse docket dates assuming US ordering (month-day-year).
+    
+    Accepts:
+    - ISO: YYYY-MM-DD (2024-10-03)
+    - Numeric MDY: M/D/YYYY, M-D-YYYY, MM/DD/YYYY, MM-DD-YYYY (single-digit month/day allowed)
+    - Month name: Oct 3, 2024, October 3, 2024
+    
+    Raises:
+        ValueError: If date cannot be parsed
+    """
+    if date_str is None:
+        raise ValueError("filed_date missing")
+    
+    s = str(date_str).strip()
+    if not s:
+        raise ValueError("filed_date missing")
+    
+    return _parse_date_str(s)
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_date_str(s: str) -> date:
+    """parse_date for a stripped, non-empty string (memoized; failures raise and are not cached)"""
+    if len(s) == 10 and s[4] == '-' and s[7] == '-':
+        # 0) Canonical YYYY-MM-DD: C parser; invalid dates fall through for the error message
+        try:
+            return date.fromisoformat(s)
+        except ValueError:
+            pass
+    if s[0].isdigit():
+        # 1) ISO YYYY-M-D or 2) numeric MDY, single-digit month/day allowed (one match)
+        numeric = _DATE_NUMERIC_RE.match(s)
+        if numeric:
+            if numeric.group('y1'):
+                try:
+                    return date(int(numeric.group('y1')), int(numeric.group('m1')), int(numeric.group('d1')))
+                except ValueError:
+                    raise ValueError(f"filed_date parse failed: {s!r}")
+            try:
+                return date(int(numeric.group('y2')), int(numeric.group('m2')), int(numeric.group('d2')))
+            except ValueError as e:
+                # e.g., 13-40-2024 will land here
+                raise ValueError(f"filed_date parse failed (mdy numeric): {s!r}: {e}")
+    else:
+        # 3) Named month: Oct 3, 2024 or October 3, 2024
+        named = _DATE_NAMED_RE.match(s)
+        if named:
+            month = _MONTHS.get(named.group(1).lower())
+            if month:
+                try:
+                    return date(int(named.group(3)), month, int(named.group(2)))
+                except ValueError:
+                    pass
+    
+    # Final failure
+    raise ValueError(f"filed_date parse failed: {s!r}")
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_parties_cached(parties_str: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Parse parties string into (name, role) tuples
+    
+    Handles various formats:
+    - "John Smith (plaintiff); Acme Corp, Jane Doe (defendants)"
+    - "TechStart Inc (plaintiff), MegaCorp (defendant)"
+    - "Robert Anderson (plaintiff) / HealthPlus Insurance Co. (defendant)"
+    
+    Returns:
+        Tuple of tuples: ((party_name, role), ...), hashable so it can be cached
+    """
+    if not parties_str:
+        return ()
+    
+    parties = []
+    
+    # Split by semicolon or slash first (major separators)
+    major_sections = _PARTIES_SPLIT_RE.split(parties_str)
+    
+    for section in major_sections:
+        section = section.strip()
+        if not section:
+            continue
+        
+        # Try to extract role from parentheses
+        role_match = _ROLE_RE.search(section)
+        
+        if role_match:
+            role = role_match.group(1).lower()
+            # Normalize plural forms
+            if role.endswith('s'):
+                role = role[:-1]
+            
+            # Remove role from section
+            section = _PAREN_RE.sub('', section).strip()
+            
+            # Split by comma to get individual parties
+            party_names = [p.strip() for p in section.split(',') if p.strip()]
+            
+            for party_name in party_names:
+                if party_name:
+                    parties.append((party_name, role))
+        else:
+            # No role specified, try to infer from context or mark as 'other'
+            party_names = [p.strip() for p in section.split(',') if p.strip()]
+            for party_name in party_names:
+                if party_name:
+                    parties.append((party_name, 'other'))
+    
+    return tuple(parties)
+
+
+def parse_parties(parties_str: str) -> List[Tuple[str, str]]:
+    """Memoized wrapper around _parse_parties_cached; returns a fresh list per call"""
+    return list(_parse_parties_cached(parties_str))
+
+
+def validate_docket(docket: Dict) -> Dict:
+    """
+    Validate and normalize a single docket record
+    
+    Pure function (no database access or shared state), so it can run in
+    worker processes. Only derived fields are returned: title and docket_text
+    are read from the raw docket, so the bulk of a record is never sent back
+    from a worker.
+    
+    Returns:
+        Dict of cleaned fields plus parsed parties as [(party_name, role), ...]
+        
+    Raises:
+        ValueError: For validation errors (missing required fields, bad dates, etc.)
+    """
+    # Extract and validate required fields
+    case_number = docket.get('case_number', '').strip()
+    if not case_number:
+        raise ValueError("case_number is required and cannot be empty")
+    
+    # Parse date - raises ValueError if invalid
+    filed_date_str = docket.get('filed_date', '')
+    filed_date = parse_date(filed_date_str)  # Returns date object
+    
+    # Related entities are resolved later; reject the ones that can't be
+    court = docket.get('court', '')
+    if not court:
+        raise ValueError("Court name cannot be empty")
+    case_type = docket.get('case_type', 'civil')
+    if not case_type:
+        raise ValueError("Case type cannot be empty")
+    
+    # Validate status
+    status = docket.get('status', 'active').lower()
+    if status not in ['active', 'closed', 'pending', 'dismissed']:
+        raise ValueError(f"Invalid status '{status}'. Must be one of: active, closed, pending, dismissed")
+    
+    # Parse parties (missing parties is only a warning, logged by resolve_docket)
+    parties = parse_parties(docket.get('parties', ''))
+    
+    return {
+        'case_number': case_number,
+        'court': court,
+        'judge': docket.get('judge'),
+        'case_type': case_type,
+        'filed_date': filed_date,
+        'status': status,
+        'parties': parties,
+    }
+
+
+# End-of-input marker for the writer when the reader failed: discard the pending batch
+_ABORT_WRITE = object()
+
+
+class _InlinePool:
+    """Stand-in for multiprocessing.Pool that maps in the calling process"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def imap(self, func, iterable, chunksize=1):
+        return map(func, iterable)
+
+
+# Raw fields validate_docket reads; workers get only these (not title/docket_text)
+VALIDATED_FIELDS = ('case_number', 'filed_date', 'court', 'judge', 'case_type', 'status', 'parties')
+
+
+def _validate_for_pipeline(docket: Dict) -> Tuple[Optional[Dict], Optional[Exception]]:
+    """validate_docket for Pool.imap: return the error instead of raising it"""
+    try:
+        return validate_docket(docket), None
+    except Exception as e:
+        return None, e
+
+
+def _validate_stream(pool, dockets: Iterator[Dict]) -> Iterator[Tuple[Dict, Optional[Dict], Optional[Exception]]]:
+    """
+    Yield (docket, prepared, error) for a docket stream, in input order
+    
+    Records go to the pool VALIDATE_WINDOW at a time: Pool.imap would otherwise
+    read the whole input ahead of the workers. Keeping file order means a
+    repeated case_number still resolves to its last occurrence.
+    """
+    inline = isinstance(pool, _InlinePool)
+    while True:
+        window = list(itertools.islice(dockets, VALIDATE_WINDOW))
+        if not window:
+            return
+        # Worker processes only need the fields they validate; skip pickling the text
+        tasks = window if inline else [
+            {k: docket[k] for k in VALIDATED_FIELDS if k in docket} if isinstance(docket, dict) else docket
+            for docket in window
+        ]
+        results = pool.imap(_validate_for_pipeline, tasks, chunksize=VALIDATE_CHUNKSIZE)
+        for docket, (prepared, error) in zip(window, results):
+            yield docket, prepared, error
+
+
+class CaseBatch:
+    """
+    Cases waiting for the next batch upsert, stored as parallel columns
+    
+    Slot i of every column belongs to the same case_number; index maps
+    case_number -> slot. A case_number queued again before the flush replaces the
+    earlier row (last one wins, as with sequential upserts) and adds its parties.
+    """
+    
+    __slots__ = ('index', 'dockets', 'case_rows', 'parties', 'occurrences')
+    
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.dockets: List[Dict] = []                      # raw docket (last occurrence)
+        self.case_rows: List[Tuple] = []                   # row in CASE_COLUMNS order
+        self.parties: List[List[Tuple[str, str, str]]] = []  # [(name, normalized, role), ...]
+        self.occurrences: List[int] = []                   # times the case_number was queued
+    
+    def __len__(self) -> int:
+        return len(self.case_rows)
+    
+    def add(self, docket: Dict, case_row: Tuple, parties: List[Tuple[str, str, str]]):
+        """Queue a case row, merging it into the slot of an already queued case_number"""
+        case_number = case_row[0]
+        i = self.index.get(case_number)
+        if i is None:
+            self.index[case_number] = len(self.case_rows)
+            self.dockets.append(docket)
+            self.case_rows.append(case_row)
+            self.parties.append(list(parties))
+            self.occurrences.append(1)
+        else:
+            self.dockets[i] = docket
+            self.case_rows[i] = case_row
+            self.parties[i].extend(parties)
+            self.occurrences[i] += 1
 
 
 class DocketIngester:
@@ -72,9 +564,19 @@ class DocketIngester:
         # Track processed case numbers to detect duplicates
         self.processed_cases = set()
         
+        # Validated cases waiting for the next batch upsert
+        self.pending_cases = CaseBatch()
+        
+        # Name variations seen since the last flush: kind -> Counter of (entity_id, raw_name)
+        self.pending_variations: Dict[str, Counter] = {kind: Counter() for kind in VARIATION_TABLES}
+        
         # Run tracking
         self.run_id = None
         self.quarantine_path = None
+        self._quarantine_fh = None  # append handle for quarantine_path, open for the run
+        self._writer_error = None
+        self._created_parties: List[str] = []  # parties inserted by the last resolve_parties
+        self._writer_failed = threading.Event()  # set by the writer thread when it dies
         
         # Statistics
         self.stats = {
@@ -98,13 +600,22 @@ class DocketIngester:
         try:
             self.conn = psycopg2.connect(**self.db_config)
             self.cursor = self.conn.cursor()
+            self.prepare_statements()
             logger.info("Connected to database successfully")
         except psycopg2.Error as e:
             logger.error(f"Database connection failed: {e}")
             raise
     
+    def prepare_statements(self):
+        """PREPARE the statements in PREPARED_STATEMENTS and create the COPY staging tables"""
+        for name, statement in PREPARED_STATEMENTS.items():
+            self.cursor.execute(f"PREPARE {name} AS {statement}")
+        self.cursor.execute(STAGING_TABLES_SQL)
+        self.conn.commit()
+    
     def close(self):
         """Close database connection"""
+        self.close_quarantine()
         if self.cursor:
             self.cursor.close()
         if self.conn:
@@ -137,13 +648,24 @@ class DocketIngester:
             logger.info(f"Started ingestion run {run_id} for source: {source_name}")
             return run_id
     
-    def finish_run(self, run_id: int, totals: Dict[str, int]):
+    def warm_caches(self):
+        """Load the court/judge/case type/party lookup caches with one SELECT per table"""
+        for attr, query in WARM_CACHE_SQL.items():
+            self.cursor.execute(query)
+            setattr(self, attr, dict(self.cursor.fetchall()))
+        self.conn.commit()
+        logger.info("Warmed lookup caches: " + ", ".join(
+            f"{attr}={len(getattr(self, attr))}" for attr in WARM_CACHE_SQL
+        ))
+    
+    def finish_run(self, run_id: int, totals: Dict[str, int], notes: Optional[str] = None):
         """
         Finish an ingestion run and update totals
         
         Args:
             run_id: The run ID to finish
             totals: Dictionary with keys: read, inserted, updated, failed
+            notes: Optional note for the run (e.g. why it stopped early)
         """
         with self.conn.cursor() as cur:
             cur.execute(
@@ -153,7 +675,8 @@ class DocketIngester:
                        total_read = %s,
                        total_inserted = %s,
                        total_updated = %s,
-                       total_failed = %s
+                       total_failed = %s,
+                       notes = COALESCE(%s, notes)
                  WHERE run_id = %s
                 """,
                 (
@@ -161,13 +684,40 @@ class DocketIngester:
                     totals.get("inserted", 0),
                     totals.get("updated", 0),
                     totals.get("failed", 0),
+                    notes,
                     run_id,
                 ),
             )
             self.conn.commit()
             logger.info(f"Finished ingestion run {run_id}")
     
-    def write_quarantine_jsonl(self, run_id: int, raw_row: Dict, error_code: str, why: str, path: Optional[str] = None) -> str:
+    def abort_run(self, run_id: Optional[int], error: Exception):
+        """Close out a run that stopped early: partial totals, the error in notes"""
+        if run_id is None or not self.conn:
+            return
+        try:
+            self.conn.rollback()
+            self.finish_run(run_id, self.counts, notes=f"aborted: {error}")
+        except psycopg2.Error as e:
+            logger.error(f"Could not record run {run_id} as aborted: {e}")
+    
+    def refresh_entity_stats(self):
+        """Refresh the entity_norm_stats materialized view read by data_quality.py"""
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY entity_norm_stats")
+            self.conn.commit()
+        except errors.UndefinedTable:
+            # Database created before the view; the report aggregates live instead
+            self.conn.rollback()
+            logger.info("entity_norm_stats not found (re-apply schema.sql to create it); skipping refresh")
+        except psycopg2.Error as e:
+            # Stats are only used by the report; never fail an ingest run over them
+            self.conn.rollback()
+            logger.warning(f"Could not refresh entity_norm_stats: {e}")
+    
+    def write_quarantine_jsonl(self, run_id: int, raw_row: Dict, error_code: str, why: str,
+                               path: Optional[str] = None) -> Tuple[str, str]:
         """
         Write a failed record to quarantine JSONL file
         
@@ -179,14 +729,12 @@ class DocketIngester:
             path: Optional path to quarantine file (auto-generated if None)
             
         Returns:
-            Absolute path to the quarantine file
+            Tuple of (absolute path to the quarantine file, record_hash of raw_row)
         """
         if not path:
             path = os.path.join(QUARANTINE_DIR, f"ingest_run_{run_id}.jsonl")
         
-        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
-        
-        record_hash = sha256_hex(canonical_json(raw_row))
+        record_hash = record_hash_hex(canonical_json(raw_row))
         rec = {
             "run_id": run_id,
             "error_code": error_code,
@@ -196,16 +744,31 @@ class DocketIngester:
             "record_hash": record_hash,
         }
         
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        # One buffered handle per quarantine file instead of open/write/close per record
+        path = os.path.abspath(path)
+        if self._quarantine_fh is None or self._quarantine_fh.name != path:
+            self.close_quarantine()
+            pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._quarantine_fh = open(path, "ab", buffering=QUARANTINE_BUFFER_SIZE)
+        self._quarantine_fh.write(orjson.dumps(rec) + b"\n")
         
-        return os.path.abspath(path)
+        return path, record_hash
+    
+    def close_quarantine(self):
+        """Flush and close the quarantine file handle, if one is open"""
+        if self._quarantine_fh is not None:
+            self._quarantine_fh.close()
+            self._quarantine_fh = None
     
     def record_error(self, run_id: int, raw_row: Dict, error_code: str, error_msg: str, 
-                     case_number: Optional[str] = None, normalized_attempt: Optional[Dict] = None):
+                     case_number: Optional[str] = None, normalized_attempt: Optional[Dict] = None,
+                     record_hash: Optional[str] = None):
         """
         Record an error in the ingest_errors table
         
+        Not committed here: the row is committed with the next batch by flush_cases(),
+        which ingest_file always runs at the end of the input.
+        
         Args:
             run_id: The ingestion run ID
             raw_row: The raw record that failed
@@ -213,8 +776,10 @@ class DocketIngester:
             error_msg: Human-readable error message
             case_number: Optional case number for quick filtering
             normalized_attempt: Optional dict with normalized values that were attempted
+            record_hash: Hash of raw_row if already computed (e.g. by write_quarantine_jsonl)
         """
-        record_hash = sha256_hex(canonical_json(raw_row))
+        if record_hash is None:
+            record_hash = record_hash_hex(canonical_json(raw_row))
         details = {
             "raw": raw_row,
             "normalized_attempt": normalized_attempt or {},
@@ -240,206 +805,36 @@ class DocketIngester:
                 cur.execute(
                     """
                     INSERT INTO ingest_errors
-                        (run_id, record_hash, case_number, error_code, error_message, details)
-                    VALUES (%s, %s, %s, %s, %s, %s)
+                        (run_id, record_hash, case_number, error_code, error_kind, error_message, details)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
                     """,
-                    (run_id, record_hash, case_number, error_code, error_msg, json.dumps(details)),
+                    (run_id, record_hash, case_number, error_code, ERROR_KINDS.get(error_code),
+                     error_msg, orjson.dumps(details).decode()),
                 )
-        
-        self.conn.commit()
-    
-    def normalize_court_name(self, court: str) -> str:
-        """
-        Normalize court name to handle variations
-        
-        Examples:
-        - "S.D.N.Y" -> "SDNY"
-        - "S.D.N.Y." -> "SDNY"
-        - "N.D. Cal." -> "NDCAL"
-        """
-        if not court:
-            return ""
-        
-        # Remove periods, spaces, convert to uppercase
-        normalized = re.sub(r'[.\s]+', '', court.upper())
-        return normalized
-    
-    def normalize_judge_name(self, judge: str) -> str:
-        """
-        Normalize judge name by removing titles and extra whitespace
-        
-        Examples:
-        - "Hon. Maria Rodriguez" -> "maria rodriguez"
-        - "Judge Sarah Chen" -> "sarah chen"
-        """
-        if not judge:
-            return ""
-        
-        # Remove common titles
-        normalized = re.sub(r'^(hon\.?|judge|justice)\s+', '', judge, flags=re.IGNORECASE)
-        # Normalize whitespace and convert to lowercase
-        normalized = ' '.join(normalized.split()).lower()
-        return normalized
-    
-    def normalize_party_name(self, party: str) -> str:
-        """
-        Normalize party name for matching variations
-        
-        Examples:
-        - "Acme Corp" -> "acme corp"
-        - "Acme Corporation" -> "acme corporation" (kept separate for now)
-        """
-        if not party:
-            return ""
-        
-        # Remove extra whitespace, convert to lowercase
-        normalized = ' '.join(party.split()).lower().strip()
-        return normalized
-    
-    def parse_date(self, date_str: str) -> date:
-        """
-        Parse docket dates assuming US ordering (month-day-year).
-        
-        Accepts:
-        - ISO: YYYY-MM-DD (2024-10-03)
-        - Numeric MDY: M/D/YYYY, M-D-YYYY, MM/DD/YYYY, MM-DD-YYYY (single-digit month/day allowed)
-        - Month name: Oct 3, 2024, October 3, 2024
-        
-        Raises:
-            ValueError: If date cannot be parsed
-        """
-        if date_str is None:
-            raise ValueError("filed_date missing")
-        
-        s = str(date_str).strip()
-        if not s:
-            raise ValueError("filed_date missing")
-        
-        # 1) Try ISO (strict)
-        try:
-            return datetime.strptime(s, '%Y-%m-%d').date()
-        except ValueError:
-            pass
-        
-        # 2) Try numeric MDY with regex to allow single-digit month/day
-        # Pattern: M-D-YYYY or M/D/YYYY (1-2 digits for month, 1-2 digits for day)
-        mdy_numeric = re.match(r'^\s*(\d{1,2})[-/](\d{1,2})[-/](\d{4})\s*$', s)
-        if mdy_numeric:
-            mm, dd, yyyy = map(int, mdy_numeric.groups())
-            try:
-                return date(yyyy, mm, dd)
-            except ValueError as e:
-                # e.g., 13-40-2024 will land here
-                raise ValueError(f"filed_date parse failed (mdy numeric): {s!r}: {e}")
-        
-        # 3) Try named-month forms
-        for fmt in ['%b %d, %Y', '%B %d, %Y']:  # Oct 3, 2024 or October 3, 2024
-            try:
-                return datetime.strptime(s, fmt).date()
-            except ValueError:
-                pass
-        
-        # 4) Try standard mdy forms with zero-padded expectations
-        for fmt in ['%m/%d/%Y', '%m-%d-%Y']:  # 10/03/2024 or 10-03-2024
-            try:
-                return datetime.strptime(s, fmt).date()
-            except ValueError:
-                pass
-        
-        # Final failure
-        raise ValueError(f"filed_date parse failed: {s!r}")
-    
-    def parse_parties(self, parties_str: str) -> List[Tuple[str, str]]:
-        """
-        Parse parties string into list of (name, role) tuples
-        
-        Handles various formats:
-        - "John Smith (plaintiff); Acme Corp, Jane Doe (defendants)"
-        - "TechStart Inc (plaintiff), MegaCorp (defendant)"
-        - "Robert Anderson (plaintiff) / HealthPlus Insurance Co. (defendant)"
-        
-        Returns:
-            List of tuples: [(party_name, role), ...]
-        """
-        if not parties_str:
-            return []
-        
-        parties = []
-        
-        # Split by semicolon or slash first (major separators)
-        major_sections = re.split(r'[;/]', parties_str)
-        
-        for section in major_sections:
-            section = section.strip()
-            if not section:
-                continue
-            
-            # Try to extract role from parentheses
-            role_match = re.search(r'\((plaintiff|defendant|plaintiffs|defendants|third_party|intervenor|other)\)', 
-                                 section, re.IGNORECASE)
-            
-            if role_match:
-                role = role_match.group(1).lower()
-                # Normalize plural forms
-                if role.endswith('s'):
-                    role = role[:-1]
-                
-                # Remove role from section
-                section = re.sub(r'\([^)]+\)', '', section).strip()
-                
-                # Split by comma to get individual parties
-                party_names = [p.strip() for p in section.split(',') if p.strip()]
-                
-                for party_name in party_names:
-                    if party_name:
-                        parties.append((party_name, role))
-            else:
-                # No role specified, try to infer from context or mark as 'other'
-                party_names = [p.strip() for p in section.split(',') if p.strip()]
-                for party_name in party_names:
-                    if party_name:
-                        parties.append((party_name, 'other'))
-        
-        return parties
     
     def record_court_variation(self, court_id: int, raw_name: str):
-        """Record a court name variation"""
-        self.cursor.execute(
-            """
-            INSERT INTO court_name_variations (court_id, raw_name)
-            VALUES (%s, %s)
-            ON CONFLICT (court_id, raw_name) DO UPDATE
-                SET last_seen_at = now(),
-                    seen_count = court_name_variations.seen_count + 1
-            """,
-            (court_id, raw_name)
-        )
+        """Record a court name variation (written by flush_variations)"""
+        self.pending_variations["court"][(court_id, raw_name)] += 1
     
     def get_or_create_court(self, court_name: str) -> int:
         """Get or create court record, return court_id"""
         if not court_name:
             raise ValueError("Court name cannot be empty")
         
-        normalized = self.normalize_court_name(court_name)
+        normalized = normalize_court_name(court_name)
         
         if normalized in self.courts_cache:
             court_id = self.courts_cache[normalized]
         else:
             # Check if exists in database
-            self.cursor.execute(
-                "SELECT id FROM courts WHERE normalized_name = %s",
-                (normalized,)
-            )
+            self.cursor.execute("EXECUTE court_sel (%s)", (normalized,))
             result = self.cursor.fetchone()
             
             if result:
                 court_id = result[0]
             else:
                 # Insert new court
-                self.cursor.execute(
-                    "INSERT INTO courts (name, normalized_name) VALUES (%s, %s) RETURNING id",
-                    (court_name, normalized)
-                )
+                self.cursor.execute("EXECUTE court_ins (%s, %s)", (court_name, normalized))
                 court_id = self.cursor.fetchone()[0]
                 logger.info(f"Created new court: {court_name} (normalized: {normalized})")
             
@@ -451,24 +846,15 @@ class DocketIngester:
         return court_id
     
     def record_judge_variation(self, judge_id: int, raw_name: str):
-        """Record a judge name variation"""
-        self.cursor.execute(
-            """
-            INSERT INTO judge_name_variations (judge_id, raw_name)
-            VALUES (%s, %s)
-            ON CONFLICT (judge_id, raw_name) DO UPDATE
-                SET last_seen_at = now(),
-                    seen_count = judge_name_variations.seen_count + 1
-            """,
-            (judge_id, raw_name)
-        )
+        """Record a judge name variation (written by flush_variations)"""
+        self.pending_variations["judge"][(judge_id, raw_name)] += 1
     
     def get_or_create_judge(self, judge_name: str) -> Optional[int]:
         """Get or create judge record, return judge_id (or None if name is empty)"""
         if not judge_name:
             return None
         
-        normalized = self.normalize_judge_name(judge_name)
+        normalized = normalize_judge_name(judge_name)
         
         if not normalized:
             return None
@@ -477,20 +863,14 @@ class DocketIngester:
             judge_id = self.judges_cache[normalized]
         else:
             # Check if exists in database
-            self.cursor.execute(
-                "SELECT id FROM judges WHERE normalized_name = %s",
-                (normalized,)
-            )
+            self.cursor.execute("EXECUTE judge_sel (%s)", (normalized,))
             result = self.cursor.fetchone()
             
             if result:
                 judge_id = result[0]
             else:
                 # Insert new judge
-                self.cursor.execute(
-                    "INSERT INTO judges (full_name, normalized_name) VALUES (%s, %s) RETURNING id",
-                    (judge_name, normalized)
-                )
+                self.cursor.execute("EXECUTE judge_ins (%s, %s)", (judge_name, normalized))
                 judge_id = self.cursor.fetchone()[0]
                 logger.info(f"Created new judge: {judge_name} (normalized: {normalized})")
             
@@ -512,20 +892,14 @@ class DocketIngester:
             return self.case_types_cache[case_type]
         
         # Check if exists in database
-        self.cursor.execute(
-            "SELECT id FROM case_types WHERE name = %s",
-            (case_type,)
-        )
+        self.cursor.execute("EXECUTE case_type_sel (%s)", (case_type,))
         result = self.cursor.fetchone()
         
         if result:
             type_id = result[0]
         else:
             # Insert new case type
-            self.cursor.execute(
-                "INSERT INTO case_types (name) VALUES (%s) RETURNING id",
-                (case_type,)
-            )
+            self.cursor.execute("EXECUTE case_type_ins (%s)", (case_type,))
             type_id = self.cursor.fetchone()[0]
             logger.info(f"Created new case type: {case_type}")
         
@@ -533,145 +907,241 @@ class DocketIngester:
         return type_id
     
     def record_party_variation(self, party_id: int, raw_name: str):
-        """Record a party name variation"""
-        self.cursor.execute(
-            """
-            INSERT INTO party_name_variations (party_id, raw_name)
-            VALUES (%s, %s)
-            ON CONFLICT (party_id, raw_name) DO UPDATE
-                SET last_seen_at = now(),
-                    seen_count = party_name_variations.seen_count + 1
-            """,
-            (party_id, raw_name)
-        )
+        """Record a party name variation (written by flush_variations)"""
+        self.pending_variations["party"][(party_id, raw_name)] += 1
     
-    def get_or_create_party(self, party_name: str) -> int:
-        """Get or create party record, return party_id"""
-        if not party_name:
-            raise ValueError("Party name cannot be empty")
-        
-        normalized = self.normalize_party_name(party_name)
+    def resolve_parties(self, batch_parties: List[List[Tuple[str, str, str]]]) -> List[List[Tuple[int, str]]]:
+        """
+        Resolve a batch's parties to IDs, creating missing parties in one statement
         
-        if normalized in self.parties_cache:
-            party_id = self.parties_cache[normalized]
-        else:
-            # Check if exists in database
-            self.cursor.execute(
-                "SELECT id FROM parties WHERE normalized_name = %s",
-                (normalized,)
-            )
-            result = self.cursor.fetchone()
-            
-            if result:
-                party_id = result[0]
-            else:
-                # Insert new party
-                self.cursor.execute(
-                    "INSERT INTO parties (name, normalized_name) VALUES (%s, %s) RETURNING id",
-                    (party_name, normalized)
-                )
-                party_id = self.cursor.fetchone()[0]
-            
-            self.parties_cache[normalized] = party_id
+        Args:
+            batch_parties: CaseBatch.parties, [(name, normalized_name, role), ...] per case
         
-        # Record this variation (always record, tracks all seen forms)
-        self.record_party_variation(party_id, party_name)
+        Returns:
+            [(party_id, role), ...] per case, in the same order
         
-        return party_id
+        Callers run this inside a savepoint; after rolling it back they undo the
+        cache and variation side effects with forget_parties().
+        """
+        missing = {}  # normalized_name -> first raw name seen (stored as parties.name)
+        for parties in batch_parties:
+            for party_name, normalized, _ in parties:
+                if normalized not in self.parties_cache:
+                    missing.setdefault(normalized, party_name)
+        
+        self._created_parties = list(missing)
+        if missing:
+            rows = execute_values(
+                self.cursor, UPSERT_PARTIES_SQL,
+                [(party_name, normalized) for normalized, party_name in missing.items()],
+                page_size=len(missing), fetch=True
+            )
+            self.parties_cache.update(rows)
+        
+        party_links = []
+        for parties in batch_parties:
+            links = []
+            for party_name, normalized, role in parties:
+                party_id = self.parties_cache[normalized]
+                # Record this variation (always record, tracks all seen forms)
+                self.record_party_variation(party_id, party_name)
+                links.append((party_id, role))
+            party_links.append(links)
+        return party_links
+    
+    def forget_parties(self, party_variations: Counter):
+        """Undo resolve_parties after its savepoint was rolled back (IDs it cached no longer exist)"""
+        for normalized in self._created_parties:
+            self.parties_cache.pop(normalized, None)
+        self._created_parties = []
+        self.pending_variations["party"] = party_variations
     
-    def process_docket(self, docket: Dict) -> Tuple[bool, str]:
+    def resolve_docket(self, prepared: Dict, docket: Dict) -> Tuple[Tuple, List[Tuple[str, str, str]]]:
         """
-        Process a single docket record
+        Resolve court/judge/case type IDs for a prepared docket (title/docket_text come from the raw docket)
+        
+        The case row itself is written later by flush_cases() as part of a batch;
+        parties are resolved for the whole batch there (resolve_parties).
         
         Returns:
-            Tuple of (success: bool, action: str) where action is 'inserted' or 'updated'
-            
-        Raises:
-            ValueError: For validation errors (missing required fields, bad dates, etc.)
+            Tuple of (case row in UPSERT_CASES_SQL column order, [(name, normalized_name, role), ...])
         """
-        # Extract and validate required fields
-        case_number = docket.get('case_number', '').strip()
-        if not case_number:
-            raise ValueError("case_number is required and cannot be empty")
+        case_number = prepared['case_number']
         
-        # Parse date - raises ValueError if invalid
-        filed_date_str = docket.get('filed_date', '')
-        filed_date = self.parse_date(filed_date_str)  # Returns date object
+        # Note: Missing parties is not a fatal error, just a warning
+        if not prepared['parties']:
+            logger.warning(f"No parties found for case {case_number}")
+            self.stats['warnings'].append(f"No parties for case {case_number}")
         
         # Get or create related entities - these may raise ValueError
-        court_id = self.get_or_create_court(docket.get('court', ''))
-        judge_id = self.get_or_create_judge(docket.get('judge'))
-        case_type_id = self.get_or_create_case_type(docket.get('case_type', 'civil'))
-        
-        # Validate status
-        status = docket.get('status', 'active').lower()
-        if status not in ['active', 'closed', 'pending', 'dismissed']:
-            raise ValueError(f"Invalid status '{status}'. Must be one of: active, closed, pending, dismissed")
-        
-        # True upsert with ON CONFLICT DO UPDATE
-        # Use xmax = 0 to detect if row was newly inserted (xmax = 0) or updated (xmax > 0)
-        self.cursor.execute(
-            """
-            INSERT INTO cases (case_number, court_id, title, filed_date, case_type_id, 
-                             judge_id, docket_text, status)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (case_number) DO UPDATE
-                SET court_id = EXCLUDED.court_id,
-                    title = EXCLUDED.title,
-                    filed_date = EXCLUDED.filed_date,
-                    case_type_id = EXCLUDED.case_type_id,
-                    judge_id = EXCLUDED.judge_id,
-                    docket_text = EXCLUDED.docket_text,
-                    status = EXCLUDED.status,
-                    updated_at = now()
-            RETURNING id, (xmax = 0) AS inserted
-            """,
-                (
-                    case_number,
-                    court_id,
-                    docket.get('title', ''),
-                    filed_date,  # Already a date object
-                    case_type_id,
-                    judge_id,
-                    docket.get('docket_text', ''),
-                    status
-                )
+        court_id = self.get_or_create_court(prepared['court'])
+        judge_id = self.get_or_create_judge(prepared['judge'])
+        case_type_id = self.get_or_create_case_type(prepared['case_type'])
+        
+        case_row = (
+            case_number,
+            court_id,
+            docket.get('title', ''),
+            prepared['filed_date'],
+            case_type_id,
+            judge_id,
+            docket.get('docket_text', ''),
+            prepared['status']
         )
-        result = self.cursor.fetchone()
-        case_id = result[0]
-        is_inserted = result[1]  # True if inserted, False if updated
-        
-        action = 'inserted' if is_inserted else 'updated'
         
         self.processed_cases.add(case_number)
         
-        # Parse and insert parties
-        parties_str = docket.get('parties', '')
-        parties = self.parse_parties(parties_str)
+        parties = [
+            (party_name, normalize_party_name(party_name), role)
+            for party_name, role in prepared['parties']
+        ]
         
-        # Note: Missing parties is not a fatal error, just a warning
-        if not parties:
-            logger.warning(f"No parties found for case {case_number}")
-            self.stats['warnings'].append(f"No parties for case {case_number}")
+        return case_row, parties
+    
+    def process_docket(self, docket: Dict) -> Tuple[Tuple, List[Tuple[str, str, str]]]:
+        """
+        Validate a docket and resolve its IDs in one step (validate_docket + resolve_docket)
+        
+        Raises:
+            ValueError: For validation errors (missing required fields, bad dates, etc.)
+        """
+        return self.resolve_docket(validate_docket(docket), docket)
+    
+    def queue_case(self, docket: Dict, case_row: Tuple, parties: List[Tuple[str, str, str]]):
+        """Add a processed docket to the pending batch (see CaseBatch.add)"""
+        self.pending_cases.add(docket, case_row, parties)
+    
+    def _upsert_cases(self, case_rows: List[Tuple], party_links: List[List[Tuple[int, str]]],
+                      occurrences: List[int]) -> Tuple[int, int]:
+        """
+        Upsert pending cases and their party links (case_rows/occurrences are CaseBatch columns)
+        
+        Uses xmax = 0 to detect if a row was newly inserted (xmax = 0) or updated (xmax > 0).
+        Batches of COPY_MIN_ROWS or more go through COPY and the staging tables.
+        
+        Returns:
+            Tuple of (inserted, updated) counts, duplicates within the batch counted as updates
+        """
+        use_copy = len(case_rows) >= COPY_MIN_ROWS
+        if use_copy:
+            self.cursor.copy_expert(f"COPY cases_staging ({CASE_COLUMNS}) FROM STDIN", copy_text(case_rows))
+            self.cursor.execute(UPSERT_CASES_FROM_STAGING_SQL)
+            rows = self.cursor.fetchall()
         else:
-            for party_name, role in parties:
-                try:
-                    party_id = self.get_or_create_party(party_name)
-                    
-                    # Insert case-party relationship
-                    self.cursor.execute(
-                        """
-                        INSERT INTO case_parties (case_id, party_id, role)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT (case_id, party_id, role) DO NOTHING
-                        """,
-                        (case_id, party_id, role)
-                    )
-                except Exception as e:
-                    logger.error(f"Error processing party '{party_name}' for case {case_number}: {e}")
-                    self.stats['warnings'].append(f"Error processing party for case {case_number}: {e}")
+            rows = execute_values(
+                self.cursor, UPSERT_CASES_SQL, case_rows, page_size=len(case_rows), fetch=True
+            )
+        case_ids = {case_number: case_id for case_number, case_id, _ in rows}
+        inserted = sum(1 for row in rows if row[2])
+        updated = sum(occurrences) - inserted
+        
+        links = [
+            (case_ids[case_row[0]], party_id, role)
+            for case_row, row_links in zip(case_rows, party_links)
+            for party_id, role in row_links
+        ]
+        if links and use_copy:
+            self.cursor.copy_expert("COPY case_parties_staging (case_id, party_id, role) FROM STDIN", copy_text(links))
+            self.cursor.execute(INSERT_CASE_PARTIES_FROM_STAGING_SQL)
+        elif links:
+            execute_values(self.cursor, INSERT_CASE_PARTIES_SQL, links, page_size=len(links))
+        
+        return inserted, updated
+    
+    def flush_variations(self):
+        """Upsert the name variations counted since the last flush, one statement per table"""
+        for kind, counter in self.pending_variations.items():
+            if counter:
+                rows = [(entity_id, raw_name, n) for (entity_id, raw_name), n in counter.items()]
+                execute_values(self.cursor, UPSERT_VARIATIONS_SQL[kind], rows, page_size=len(rows))
+                counter.clear()
+    
+    def discard_pending(self):
+        """
+        Roll back everything since the last flush (pending cases, variations, errors)
+        
+        Lookup caches are cleared too: they may hold IDs of courts/judges/case types
+        created in the rolled-back transaction.
+        """
+        self.conn.rollback()
+        self.pending_cases = CaseBatch()
+        for counter in self.pending_variations.values():
+            counter.clear()
+        for attr in WARM_CACHE_SQL:
+            getattr(self, attr).clear()
+    
+    def flush_cases(self, run_id: int):
+        """
+        Write pending parties, all pending cases and name variations in one batch, then commit
+        
+        Parties and cases are written under one savepoint: if the batch fails, it is
+        rolled back and retried one case (with its parties) at a time so only the
+        offending records are quarantined. Name variations are flushed afterwards
+        under their own savepoint; they are bookkeeping, so a failure there is
+        logged and never fails a case.
+        """
+        batch = self.pending_cases
+        self.pending_cases = CaseBatch()
+        
+        if batch:
+            party_variations = self.pending_variations["party"].copy()
+            self.cursor.execute("SAVEPOINT case_batch")
+            try:
+                party_links = self.resolve_parties(batch.parties)
+                inserted, updated = self._upsert_cases(batch.case_rows, party_links, batch.occurrences)
+                self.cursor.execute("RELEASE SAVEPOINT case_batch")
+                self.counts['inserted'] += inserted
+                self.counts['updated'] += updated
+            except psycopg2.Error as e:
+                self.cursor.execute("ROLLBACK TO SAVEPOINT case_batch")
+                self.forget_parties(party_variations)
+                logger.warning(f"Batch upsert of {len(batch)} cases failed, retrying individually: {e}")
+                
+                for i in range(len(batch)):
+                    row = slice(i, i + 1)
+                    party_variations = self.pending_variations["party"].copy()
+                    self.cursor.execute("SAVEPOINT case_row")
+                    try:
+                        party_links = self.resolve_parties(batch.parties[row])
+                        inserted, updated = self._upsert_cases(
+                            batch.case_rows[row], party_links, batch.occurrences[row]
+                        )
+                        self.cursor.execute("RELEASE SAVEPOINT case_row")
+                        self.counts['inserted'] += inserted
+                        self.counts['updated'] += updated
+                    except psycopg2.Error as row_error:
+                        self.cursor.execute("ROLLBACK TO SAVEPOINT case_row")
+                        self.forget_parties(party_variations)
+                        self.quarantine_record(run_id, batch.dockets[i], "UNKNOWN", str(row_error))
+                        self.counts['failed'] += batch.occurrences[i]
+                        logger.error(f"Failed to upsert case {batch.case_rows[i][0]}: {row_error}")
+        
+        self.cursor.execute("SAVEPOINT name_variations")
+        try:
+            self.flush_variations()
+            self.cursor.execute("RELEASE SAVEPOINT name_variations")
+        except psycopg2.Error as e:
+            self.cursor.execute("ROLLBACK TO SAVEPOINT name_variations")
+            for counter in self.pending_variations.values():
+                counter.clear()
+            logger.warning(f"Could not record name variations for this batch: {e}")
+        
+        self.conn.commit()
+    
+    def quarantine_record(self, run_id: int, docket: Dict, error_code: str, error_msg: str):
+        """Write a failed record to the quarantine file and the ingest_errors table"""
+        case_number = docket.get('case_number', '').strip() or None
         
-        return (True, action)
+        # Write to quarantine file
+        self.quarantine_path, record_hash = self.write_quarantine_jsonl(
+            run_id, docket, error_code, error_msg, self.quarantine_path
+        )
+        
+        # Record error in database (reusing the hash computed for the quarantine line)
+        self.record_error(
+            run_id, docket, error_code, error_msg, case_number, normalized_attempt=None,
+            record_hash=record_hash
+        )
     
     def ingest_file(self, json_file_path: str, source_name: Optional[str] = None):
         """
@@ -688,82 +1158,56 @@ class DocketIngester:
         
         # Reset counters
         self.counts = {'read': 0, 'inserted': 0, 'updated': 0, 'failed': 0}
+        self.pending_cases = CaseBatch()
+        for counter in self.pending_variations.values():
+            counter.clear()
+        run_id = None
         
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                dockets = json.load(f)
-            
-            # Start ingestion run
-            run_id = self.start_run(source_name, json_file_path)
-            self.quarantine_path = None
-            
-            logger.info(f"Loaded {len(dockets)} docket records")
-            
-            # Process each docket
-            for i, docket in enumerate(dockets, 1):
-                self.counts['read'] += 1
-                
-                try:
-                    # Process the docket - may raise ValueError for validation errors
-                    success, action = self.process_docket(docket)
-                    
-                    if success:
-                        if action == 'inserted':
-                            self.counts['inserted'] += 1
-                        elif action == 'updated':
-                            self.counts['updated'] += 1
-                    
-                    # Commit every 100 records for better performance
-                    if i % 100 == 0:
-                        self.conn.commit()
-                        logger.info(f"Processed {i}/{len(dockets)} records... "
-                                  f"(inserted: {self.counts['inserted']}, "
-                                  f"updated: {self.counts['updated']}, "
-                                  f"failed: {self.counts['failed']})")
+            with open(json_file_path, 'rb') as f:
+                # Start ingestion run
+                run_id = self.start_run(source_name, json_file_path)
+                self.quarantine_path = None
+                if WARM_CACHES:
+                    self.warm_caches()
                 
-                except ValueError as e:
-                    # Validation error - record in quarantine and error table
-                    error_code = self._determine_error_code(e, docket)
-                    error_msg = str(e)
-                    case_number = docket.get('case_number', '').strip() or None
-                    
-                    # Write to quarantine file
-                    self.quarantine_path = self.write_quarantine_jsonl(
-                        run_id, docket, error_code, error_msg, self.quarantine_path
-                    )
-                    
-                    # Record error in database
-                    self.record_error(
-                        run_id, docket, error_code, error_msg, case_number, normalized_attempt=None
-                    )
-                    
-                    self.counts['failed'] += 1
-                    logger.warning(f"Failed to process record {i}: {error_msg}")
+                # Dockets are streamed from the top-level array, never loaded all at once
+                dockets = ijson.items(f, 'item', use_float=True)
                 
-                except Exception as e:
-                    # Unknown error - record in quarantine and error table
-                    error_code = "UNKNOWN"
-                    error_msg = str(e)
-                    case_number = docket.get('case_number', '').strip() or None
-                    
-                    # Write to quarantine file
-                    self.quarantine_path = self.write_quarantine_jsonl(
-                        run_id, docket, error_code, error_msg, self.quarantine_path
-                    )
-                    
-                    # Record error in database
-                    self.record_error(
-                        run_id, docket, error_code, error_msg, case_number, normalized_attempt=None
+                # Validate/normalize in worker processes while the writer thread does all
+                # database work. The pool is forked before the writer thread starts.
+                with self._validation_pool() as pool:
+                    work_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+                    writer = threading.Thread(
+                        target=self._write_loop, args=(run_id, work_q), name="ingest-writer"
                     )
-                    
-                    self.counts['failed'] += 1
-                    logger.error(f"Unexpected error processing record {i}: {e}", exc_info=True)
+                    self._writer_error = None
+                    self._writer_failed.clear()
+                    writer.start()
+                    # Unless the whole input is read, the writer drops its last partial batch
+                    end_marker = _ABORT_WRITE
+                    try:
+                        validated = _validate_stream(pool, dockets)
+                        for i, (docket, prepared, error) in enumerate(validated, 1):
+                            if self._writer_failed.is_set():
+                                # Stop reading; the writer's error is raised below
+                                break
+                            self.counts['read'] += 1
+                            # Failures are recorded by the writer (it owns the connection)
+                            work_q.put((i, docket, prepared, error))
+                        else:
+                            end_marker = None
+                    finally:
+                        work_q.put(end_marker)
+                        writer.join()
+                        self.close_quarantine()
             
-            # Final commit
-            self.conn.commit()
+            if self._writer_error is not None:
+                raise self._writer_error
             
             # Finish the run
             self.finish_run(run_id, self.counts)
+            self.refresh_entity_stats()
             
             # Print JSON summary
             summary = {
@@ -788,15 +1232,83 @@ class DocketIngester:
         except FileNotFoundError:
             logger.error(f"File not found: {json_file_path}")
             raise
-        except json.JSONDecodeError as e:
+        except ijson.JSONError as e:
+            # Raised mid-run; batches committed before the error stay, the pending one is dropped
             logger.error(f"Invalid JSON file: {e}")
+            self.abort_run(run_id, e)
             raise
         except Exception as e:
             logger.error(f"Unexpected error during ingestion: {e}")
-            if self.conn:
-                self.conn.rollback()
+            self.abort_run(run_id, e)
             raise
     
+    def _validation_pool(self):
+        """Process pool for validate_docket (in-process map when INGEST_WORKERS <= 1)"""
+        if INGEST_WORKERS <= 1:
+            return _InlinePool()
+        return multiprocessing.Pool(INGEST_WORKERS)
+    
+    def _write_loop(self, run_id: int, work_q: queue.Queue):
+        """
+        Writer stage of ingest_file: resolve IDs, batch upserts, record failures
+        
+        Consumes (index, raw docket, prepared docket, error) items until a None
+        sentinel (flush the last batch) or _ABORT_WRITE (roll it back). Runs on
+        its own thread and is the only user of the connection while the pipeline
+        is running.
+        """
+        try:
+            while True:
+                item = work_q.get()
+                if item is None or item is _ABORT_WRITE:
+                    break
+                i, docket, prepared, error = item
+                
+                try:
+                    if error is not None:
+                        raise error
+                    case_row, parties = self.resolve_docket(prepared, docket)
+                    self.queue_case(docket, case_row, parties)
+                
+                except psycopg2.Error:
+                    # The transaction is aborted, so nothing more can be recorded: end the run
+                    raise
+                
+                except ValueError as e:
+                    # Validation error - record in quarantine and error table
+                    error_code = self._determine_error_code(e, docket)
+                    self.quarantine_record(run_id, docket, error_code, str(e))
+                    self.counts['failed'] += 1
+                    logger.warning(f"Failed to process record {i}: {e}")
+                
+                except Exception as e:
+                    # Unknown error - record in quarantine and error table
+                    self.quarantine_record(run_id, docket, "UNKNOWN", str(e))
+                    self.counts['failed'] += 1
+                    logger.error(f"Unexpected error processing record {i}: {e}", exc_info=True)
+                
+                # Upsert and commit in batches of BATCH_SIZE distinct cases. Outside the
+                # per-record handling: a batch-level failure is not record i's, it ends the run
+                if len(self.pending_cases) >= BATCH_SIZE:
+                    self.flush_cases(run_id)
+                    logger.info(f"Processed {i} records... "
+                              f"(inserted: {self.counts['inserted']}, "
+                              f"updated: {self.counts['updated']}, "
+                              f"failed: {self.counts['failed']})")
+            
+            if item is _ABORT_WRITE:
+                self.discard_pending()
+            else:
+                # Flush the last partial batch (commits)
+                self.flush_cases(run_id)
+        
+        except BaseException as e:
+            # Surface the error in ingest_file; keep draining so the producer never blocks
+            self._writer_error = e
+            self._writer_failed.set()
+            while (item := work_q.get()) is not None and item is not _ABORT_WRITE:
+                pass
+    
     def _determine_error_code(self, error: Exception, docket: Dict) -> str:
         """
         Determine error code from exception and docket data
@@ -880,49 +1392,6 @@ def selftest():
     """Self-test for date parser - run with --selftest flag"""
     print("Testing date parser...")
     
-    # Create a minimal ingester instance just for parse_date method
-    class TestIngester:
-        def parse_date(self, date_str: str) -> date:
-            """Parse docket dates assuming US ordering (month-day-year)."""
-            if date_str is None:
-                raise ValueError("filed_date missing")
-            
-            s = str(date_str).strip()
-            if not s:
-                raise ValueError("filed_date missing")
-            
-            # 1) Try ISO (strict)
-            try:
-                return datetime.strptime(s, '%Y-%m-%d').date()
-            except ValueError:
-                pass
-            
-            # 2) Try numeric MDY with regex to allow single-digit month/day
-            mdy_numeric = re.match(r'^\s*(\d{1,2})[-/](\d{1,2})[-/](\d{4})\s*$', s)
-            if mdy_numeric:
-                mm, dd, yyyy = map(int, mdy_numeric.groups())
-                try:
-                    return date(yyyy, mm, dd)
-                except ValueError as e:
-                    raise ValueError(f"filed_date parse failed (mdy numeric): {s!r}: {e}")
-            
-            # 3) Try named-month forms
-            for fmt in ['%b %d, %Y', '%B %d, %Y']:
-                try:
-                    return datetime.strptime(s, fmt).date()
-                except ValueError:
-                    pass
-            
-            # 4) Try standard mdy forms with zero-padded expectations
-            for fmt in ['%m/%d/%Y', '%m-%d-%Y']:
-                try:
-                    return datetime.strptime(s, fmt).date()
-                except ValueError:
-                    pass
-            
-            # Final failure
-            raise ValueError(f"filed_date parse failed: {s!r}")
-    
     test_cases = [
         ("10-3-2024", date(2024, 10, 3)),
         ("4-5-2023", date(2023, 4, 5)),
@@ -938,13 +1407,12 @@ def selftest():
         ("03/15/2023", date(2023, 3, 15)),
     ]
     
-    parser = TestIngester()
     passed = 0
     failed = 0
     
     for input_str, expected in test_cases:
         try:
-            result = parser.parse_date(input_str)
+            result = parse_date(input_str)
             if result == expected:
                 print(f"✅ {input_str!r} → {result}")
                 passed += 1
@@ -964,7 +1432,7 @@ def selftest():
     
     for input_str in invalid_cases:
         try:
-            result = parser.parse_date(input_str)
+            result = parse_date(input_str)
             print(f"❌ {input_str!r} → {result} (should have raised ValueError)")
             failed += 1
         except ValueError:
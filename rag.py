@@ -4,42 +4,123 @@ Part 2: RAG over docket_text with pgvector + sentence-transformers
 
 Scaling Notes:
 - Model swap: set HF_EMBED_MODEL + VECTOR_DIM; recreate case_chunk_embeddings with new dim.
-- Index tuning: increase ivfflat lists; set SET LOCAL ivfflat.probes on queries; consider HNSW when available.
-- Chunking: adjust CHUNK_SIZE/CHUNK_OVERLAP; move to token-based chunking if long docs.
-- Data volume: partition or shard case_chunk_embeddings; keep PK (case_number, chunk_id).
+- Storage: new tables store halfvec (FP16, pgvector >= 0.7; EMBEDDING_TYPE=vector keeps FP32);
+  an existing embedding column keeps its type, detected at startup.
+- Index tuning: HNSW (m, ef_construction; hnsw.ef_search per query) with ivfflat fallback on pgvector < 0.5.
+- Chunking: token windows sized to the model (CHUNK_UNIT=tokens, CHUNK_OVERLAP_TOKENS) or
+  character windows (CHUNK_UNIT=chars, CHUNK_SIZE/CHUNK_OVERLAP).
+- Data volume: case_chunk_embeddings is hash-partitioned on case_number (CHUNK_PARTITIONS);
+  shard beyond that; keep PK (case_number, chunk_id).
 - External store: swap to Qdrant/Milvus, keep search_dockets API stable.
-- Hybrid: combine FTS (to_tsvector) with vector similarity for precision.
+- Hybrid: optional keywords prefilter chunks by FTS (tsv @@ plainto_tsquery, up to
+  KEYWORD_CANDIDATES) before vector ranking.
 """
 
 from __future__ import annotations
 
+import io
 import os
 import math
-from typing import List, Dict, Tuple
+import asyncio
+import copy
+import functools
+import queue
+import struct
+import threading
+from bisect import bisect_left
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Iterator, List, Dict, Tuple, Optional
 from datetime import datetime
+import numpy as np
 import psycopg2
-from psycopg2.extras import RealDictCursor
+import torch
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from pgvector.psycopg2 import register_vector
 from sentence_transformers import SentenceTransformer
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "postgresql://postgres:postgres@db:5432/dockets")
 HF_EMBED_MODEL = os.environ.get("HF_EMBED_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
 VECTOR_DIM = int(os.environ.get("VECTOR_DIM", "384"))  # MiniLM-L6-v2
+# Column type of case_chunk_embeddings.embedding when the table is created: "halfvec"
+# (FP16, half the index and scan bytes) or "vector" (FP32, pgvector < 0.7). An existing
+# column keeps its type; see embedding_type()
+EMBEDDING_TYPE = os.environ.get("EMBEDDING_TYPE", "halfvec")
 CHUNK_SIZE = int(os.environ.get("CHUNK_SIZE", "1200"))
 CHUNK_OVERLAP = int(os.environ.get("CHUNK_OVERLAP", "200"))
+CHUNK_UNIT = os.environ.get("CHUNK_UNIT", "tokens")  # "tokens" (model tokenizer) or "chars"
+CHUNK_OVERLAP_TOKENS = int(os.environ.get("CHUNK_OVERLAP_TOKENS", "32"))
 TOP_SNIPPET_CHARS = int(os.environ.get("TOP_SNIPPET_CHARS", "280"))
+EMBED_BATCH_SIZE = int(os.environ.get("EMBED_BATCH_SIZE", "128"))  # texts per forward pass at EMBED_MAX_LEN tokens
+EMBED_MAX_LEN = int(os.environ.get("EMBED_MAX_LEN", "256"))  # tokens; longer inputs are truncated
+SEARCH_POOL_MAX = int(os.environ.get("SEARCH_POOL_MAX", "10"))  # connections in the search_dockets pool
+CHUNK_PARTITIONS = int(os.environ.get("CHUNK_PARTITIONS", "16"))  # hash partitions of case_chunk_embeddings
+QUERY_EMBED_CACHE_SIZE = int(os.environ.get("QUERY_EMBED_CACHE_SIZE", "1024"))  # distinct query strings kept encoded
+KEYWORD_CANDIDATES = int(os.environ.get("KEYWORD_CANDIDATES", "5000"))  # max keyword-matching chunks re-ranked per search
+BACKFILL_QUEUE_SIZE = int(os.environ.get("BACKFILL_QUEUE_SIZE", "2"))  # batches buffered between backfill stages
+
+# Token-length bucket bounds for embed_texts; each bucket is encoded separately
+EMBED_LENGTH_BUCKETS = (64, 128, 256, 512)
 
 _model = None
+_search_pool: Optional[ThreadedConnectionPool] = None
+_embedding_type: Optional[str] = None  # type of the existing embedding column, once read
 
 def get_model() -> SentenceTransformer:
+    """Load the embedding model once: FP16 weights on CUDA, FP32 on CPU"""
     global _model
     if _model is None:
-        _model = SentenceTransformer(HF_EMBED_MODEL)
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        model = SentenceTransformer(HF_EMBED_MODEL, device=device)
+        if device == "cuda":
+            model.half()
+        model.max_seq_length = EMBED_MAX_LEN
+        _model = model
     return _model
 
-def embed_texts(texts: List[str]) -> List[List[float]]:
-    """Generate unit-normalized embeddings"""
-    return get_model().encode(texts, normalize_embeddings=True).tolist()
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """
+    Generate unit-normalized embeddings, in input order, as a (len(texts), dim) float32 array.
+    
+    Texts are grouped into token-length buckets (EMBED_LENGTH_BUCKETS) so a batch
+    is only padded to its bucket bound, and shorter buckets run in proportionally
+    larger batches: every forward pass covers about EMBED_BATCH_SIZE * max_seq_length tokens.
+    """
+    model = get_model()
+    out = np.empty((len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32)
+    if not texts:
+        return out
+    
+    max_len = model.max_seq_length
+    lengths = model.tokenizer(
+        texts, truncation=True, max_length=max_len, return_length=True, verbose=False
+    )["length"]
+    
+    buckets: Dict[int, List[int]] = {}
+    for i, n in enumerate(lengths):
+        buckets.setdefault(bisect_left(EMBED_LENGTH_BUCKETS, n), []).append(i)
+    
+    for b, idx in buckets.items():
+        bound = min(EMBED_LENGTH_BUCKETS[b] if b < len(EMBED_LENGTH_BUCKETS) else max_len, max_len)
+        out[idx] = model.encode(
+            [texts[i] for i in idx], batch_size=max(1, EMBED_BATCH_SIZE * max_len // bound),
+            normalize_embeddings=True, convert_to_numpy=True, show_progress_bar=False
+        )
+    return out
+
+@functools.lru_cache(maxsize=QUERY_EMBED_CACHE_SIZE)
+def _embed_query_cached(query: str) -> bytes:
+    # Immutable bytes, so callers can't modify a cached vector in place
+    return get_model().encode(
+        [query], normalize_embeddings=True, convert_to_numpy=True, show_progress_bar=False
+    )[0].astype(np.float32).tobytes()
+
+def embed_query(query: str) -> np.ndarray:
+    """Embed a single query as a unit-normalized, read-only float32 vector (sent to pgvector as-is)
+
+    Repeated query strings skip the encoder (LRU of QUERY_EMBED_CACHE_SIZE entries).
+    """
+    return np.frombuffer(_embed_query_cached(query), dtype=np.float32)
 
 def chunk_text(s: str, size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[Tuple[int, str]]:
     """
@@ -53,20 +134,50 @@ def chunk_text(s: str, size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) ->
     
     size = max(1, size)
     overlap = max(0, min(overlap, size - 1))
-    chunks, i, cid = [], 0, 0
-    n = len(s)
     
-    while i < n:
-        end = min(n, i + size)
-        chunk_text = s[i:end].strip()
-        if chunk_text:  # Skip empty chunks
-            chunks.append((cid, chunk_text))
-            cid += 1
-        if end == n:
-            break
-        i = end - overlap
+    # Window starts are every (size - overlap) chars; the last window is the first
+    # one reaching the end of s, i.e. the last start below len(s) - overlap
+    starts = range(0, max(len(s) - overlap, 1), size - overlap)
+    windows = (s[i:i + size].strip() for i in starts)
+    return list(enumerate(w for w in windows if w))  # Skip empty chunks
+
+def chunk_tokens(s: str, tokenizer, max_tokens: int, overlap: int = CHUNK_OVERLAP_TOKENS) -> List[Tuple[int, str]]:
+    """
+    Split text into overlapping windows of max_tokens model tokens.
+    
+    Boundaries come from the tokenizer's offset mapping, so every chunk fits the
+    encoder without truncation and the text is tokenized once for all chunks.
     
-    return chunks
+    Returns:
+        List of (chunk_id, chunk_text) tuples
+    """
+    if not s:
+        return []
+    
+    max_tokens = max(1, max_tokens)
+    overlap = max(0, min(overlap, max_tokens - 1))
+    offsets = tokenizer(
+        s, add_special_tokens=False, return_offsets_mapping=True, verbose=False
+    )["offset_mapping"]
+    n = len(offsets)
+    
+    # Same windowing as chunk_text, over token offsets instead of characters
+    starts = range(0, max(n - overlap, 1) if n else 0, max_tokens - overlap)
+    windows = (s[offsets[i][0]:offsets[min(i + max_tokens, n) - 1][1]].strip() for i in starts)
+    return list(enumerate(w for w in windows if w))  # Skip empty chunks
+
+def chunk_docket_text(s: str, tokenizer=None) -> List[Tuple[int, str]]:
+    """
+    Chunk docket text for embedding, by model tokens or characters (CHUNK_UNIT).
+    
+    tokenizer defaults to the model's; pass a separate copy when another thread
+    may be encoding at the same time (fast tokenizers are not thread-safe).
+    """
+    if CHUNK_UNIT == "chars":
+        return chunk_text(s, CHUNK_SIZE, CHUNK_OVERLAP)
+    model = get_model()
+    # Leave room for the [CLS]/[SEP] tokens the encoder adds
+    return chunk_tokens(s, tokenizer or model.tokenizer, model.max_seq_length - 2)
 
 DDL = """
 CREATE EXTENSION IF NOT EXISTS vector;
@@ -75,156 +186,512 @@ CREATE TABLE IF NOT EXISTS case_chunk_embeddings (
   case_number   TEXT REFERENCES cases(case_number) ON DELETE CASCADE,
   chunk_id      INT,
   chunk_text    TEXT,
-  embedding     vector({dim}),
+  embedding     {vtype}({dim}),
   updated_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (case_number, chunk_id)
-);
+) PARTITION BY HASH (case_number);
+
+-- Full-text search vector for keyword-filtered (hybrid) search
+ALTER TABLE case_chunk_embeddings ADD COLUMN IF NOT EXISTS tsv tsvector
+  GENERATED ALWAYS AS (to_tsvector('english', COALESCE(chunk_text, ''))) STORED;
+
+-- Partitions only exist on a partitioned table; a table created before
+-- partitioning was introduced is left as is
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_partitioned_table
+             WHERE partrelid = 'case_chunk_embeddings'::regclass) THEN
+    FOR r IN 0..{partitions} - 1 LOOP
+      EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS case_chunk_embeddings_p%s PARTITION OF case_chunk_embeddings '
+        'FOR VALUES WITH (MODULUS %s, REMAINDER %s)', r, {partitions}, r);
+    END LOOP;
+  END IF;
+END $$;
+"""
 
+# Indexes on the partitioned table are created on every partition.
+# HNSW needs pgvector >= 0.5; it replaces the older ivfflat index once created
+HNSW_INDEX_DDL = """
+CREATE INDEX IF NOT EXISTS idx_case_chunk_embeddings_hnsw
+  ON case_chunk_embeddings USING hnsw (embedding {vtype}_cosine_ops)
+  WITH (m = 16, ef_construction = 100);
+
+DROP INDEX IF EXISTS idx_case_chunk_embeddings_cosine;
+"""
+
+FTS_INDEX_DDL = """
+CREATE INDEX IF NOT EXISTS idx_case_chunk_embeddings_tsv
+  ON case_chunk_embeddings USING gin (tsv);
+"""
+
+IVFFLAT_INDEX_DDL = """
 CREATE INDEX IF NOT EXISTS idx_case_chunk_embeddings_cosine
-  ON case_chunk_embeddings USING ivfflat (embedding vector_cosine_ops)
+  ON case_chunk_embeddings USING ivfflat (embedding {vtype}_cosine_ops)
   WITH (lists = 100);
 """
 
-def ensure_schema(conn, dim: int = VECTOR_DIM) -> None:
-    """Ensure pgvector extension and embedding table exist"""
+# Base type ("vector"/"halfvec") of the existing embedding column; no row without the table
+EMBEDDING_COLUMN_TYPE_SQL = """
+SELECT split_part(format_type(atttypid, atttypmod), '(', 1)
+FROM pg_attribute
+WHERE attrelid = to_regclass('case_chunk_embeddings')
+  AND attname = 'embedding'
+  AND NOT attisdropped
+"""
+
+def set_embedding_type(column_type: Optional[str]) -> None:
+    """Record the embedding column's type (from EMBEDDING_COLUMN_TYPE_SQL) for casts, opclasses and COPY"""
+    global _embedding_type
+    _embedding_type = column_type or None
+
+def embedding_type() -> str:
+    """Embedding column type in use: the existing column's once read, else EMBEDDING_TYPE"""
+    return _embedding_type or EMBEDDING_TYPE
+
+def ensure_schema(conn, dim: int = VECTOR_DIM, partitions: int = CHUNK_PARTITIONS) -> None:
+    """
+    Ensure pgvector extension, partitioned embedding table, FTS and ANN index (HNSW, else ivfflat) exist.
+    
+    The index opclass follows the column's actual type, which is also recorded
+    (set_embedding_type): tables created with `vector` before halfvec keep working.
+    """
     with conn.cursor() as cur:
-        cur.execute(DDL.format(dim=dim))
+        cur.execute(DDL.format(dim=dim, partitions=max(1, partitions), vtype=EMBEDDING_TYPE))
+        cur.execute(EMBEDDING_COLUMN_TYPE_SQL)
+        set_embedding_type(cur.fetchone()[0])
+        vtype = embedding_type()
+        cur.execute(FTS_INDEX_DDL)
+        cur.execute("SAVEPOINT ann_index")
+        try:
+            cur.execute(HNSW_INDEX_DDL.format(vtype=vtype))
+        except psycopg2.Error:
+            # Access method "hnsw" does not exist before pgvector 0.5
+            cur.execute("ROLLBACK TO SAVEPOINT ann_index")
+            cur.execute(IVFFLAT_INDEX_DDL.format(vtype=vtype))
     conn.commit()
 
-def _cases_missing_any_chunks(conn, limit: int = 1000) -> List[Dict]:
-    """Find cases that don't have any chunks yet"""
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+def _cases_missing_any_chunks(conn, batch_size: int = 1000) -> Iterator[List[Dict]]:
+    """
+    Stream cases that don't have any chunks yet, batch_size rows at a time.
+    
+    One anti-join over a server-side (named) cursor, read within the caller's
+    open transaction: the scan runs once, whatever is written meanwhile.
+    """
+    with conn.cursor(name="missing_cases", cursor_factory=RealDictCursor) as cur:
+        cur.itersize = batch_size
         cur.execute("""
         SELECT c.case_number, COALESCE(c.docket_text, '') AS docket_text
         FROM cases c
         LEFT JOIN case_chunk_embeddings e
           ON e.case_number = c.case_number
         WHERE e.case_number IS NULL
-        LIMIT %s
-        """, (limit,))
-        return list(cur.fetchall())
+        """)
+        while rows := cur.fetchmany(batch_size):
+            yield rows
+
+CHUNK_COLUMNS = "case_number, chunk_id, chunk_text, embedding"
+
+_UPSERT_CHUNKS_CONFLICT = """
+ON CONFLICT (case_number, chunk_id) DO UPDATE
+SET chunk_text = EXCLUDED.chunk_text,
+    embedding  = EXCLUDED.embedding,
+    updated_at = EXCLUDED.updated_at
+"""
+
+UPSERT_CHUNKS_SQL = f"""
+INSERT INTO case_chunk_embeddings ({CHUNK_COLUMNS}, updated_at)
+VALUES %s""" + _UPSERT_CHUNKS_CONFLICT
+
+# Backfill batches of CHUNK_COPY_MIN_ROWS or more are COPYed into a session temp
+# table (emptied at each commit) and upserted from there
+CHUNK_COPY_MIN_ROWS = int(os.environ.get("CHUNK_COPY_MIN_ROWS", "100"))
+
+CHUNKS_STAGING_SQL = f"""
+CREATE TEMP TABLE IF NOT EXISTS case_chunk_embeddings_staging ON COMMIT DELETE ROWS AS
+  SELECT {CHUNK_COLUMNS} FROM case_chunk_embeddings WITH NO DATA;
+"""
+
+UPSERT_CHUNKS_FROM_STAGING_SQL = f"""
+INSERT INTO case_chunk_embeddings ({CHUNK_COLUMNS}, updated_at)
+SELECT {CHUNK_COLUMNS}, CURRENT_TIMESTAMP FROM case_chunk_embeddings_staging""" + _UPSERT_CHUNKS_CONFLICT
 
-def _upsert_case_chunks(conn, case_number: str, chunks: List[Tuple[int, str]], embeds: List[List[float]]) -> None:
-    """Upsert chunks and embeddings for a case"""
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)  # signature, flags, no extension
+_PGCOPY_TRAILER = struct.pack(">h", -1)
+
+def _chunks_copy_binary(chunk_rows: List[Tuple], embeds: np.ndarray, encoding: str = "utf-8") -> io.BytesIO:
+    """
+    Render (case_number, chunk_id, chunk_text) rows and their (N, dim) embedding
+    matrix as COPY binary format.
+    
+    Embeddings use pgvector's binary input (int16 dim, int16 unused, then big-endian
+    float4 for vector / float2 for halfvec): the whole matrix is converted once and
+    each row's bytes are copied out of it, never formatted as decimal text.
+    """
+    dim = embeds.shape[1]
+    vecs = np.ascontiguousarray(embeds, dtype=">f2" if embedding_type() == "halfvec" else ">f4")
+    vec_header = struct.pack(">ihh", 4 + dim * vecs.itemsize, dim, 0)
+    
+    buf = io.BytesIO()
+    buf.write(_PGCOPY_HEADER)
+    for (case_number, cid, text), vec in zip(chunk_rows, vecs):
+        case_bytes = case_number.encode(encoding)
+        text_bytes = text.encode(encoding)
+        buf.write(struct.pack(">hi", 4, len(case_bytes)))
+        buf.write(case_bytes)
+        buf.write(struct.pack(">iii", 4, cid, len(text_bytes)))
+        buf.write(text_bytes)
+        buf.write(vec_header)
+        buf.write(vec.data)
+    buf.write(_PGCOPY_TRAILER)
+    buf.seek(0)
+    return buf
+
+def _upsert_chunks(conn, chunk_rows: List[Tuple], embeds: np.ndarray) -> None:
+    """
+    Upsert (case_number, chunk_id, chunk_text) rows with embeds[i] as row i's embedding:
+    binary COPY for large batches, else one statement.
+    """
     with conn.cursor() as cur:
-        for (cid, text), vec in zip(chunks, embeds):
-            cur.execute("""
-            INSERT INTO case_chunk_embeddings (case_number, chunk_id, chunk_text, embedding, updated_at)
-            VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
-            ON CONFLICT (case_number, chunk_id) DO UPDATE
-            SET chunk_text = EXCLUDED.chunk_text,
-                embedding  = EXCLUDED.embedding,
-                updated_at = EXCLUDED.updated_at
-            """, (case_number, cid, text, vec))
-        conn.commit()
+        if len(chunk_rows) >= CHUNK_COPY_MIN_ROWS:
+            encoding = psycopg2.extensions.encodings[conn.encoding]
+            cur.copy_expert(
+                f"COPY case_chunk_embeddings_staging ({CHUNK_COLUMNS}) FROM STDIN WITH (FORMAT binary)",
+                _chunks_copy_binary(chunk_rows, embeds, encoding),
+            )
+            cur.execute(UPSERT_CHUNKS_FROM_STAGING_SQL)
+        else:
+            # Small batches: pgvector adapts each ndarray row as a text literal ("[0.1,...]", one str() per element)
+            execute_values(cur, UPSERT_CHUNKS_SQL, [row + (vec,) for row, vec in zip(chunk_rows, embeds)],
+                           template="(%s, %s, %s, %s, CURRENT_TIMESTAMP)", page_size=500)
+
+def _drain(q: queue.Queue) -> None:
+    """Consume a stage queue up to its end marker so the upstream stage never blocks"""
+    while q.get() is not None:
+        pass
 
 def backfill_chunk_embeddings(batch_size: int = 128) -> int:
     """
     Backfill embeddings for all cases missing chunks.
     
+    Three stages run concurrently, connected by bounded queues (BACKFILL_QUEUE_SIZE):
+    fetch + chunk (own connection, one server-side cursor over the missing cases,
+    so it can run ahead of the writer), encode, and upsert + commit (own connection). Encoding
+    releases the GIL inside torch, so DB round trips overlap the next batch's forward passes.
+    
     Args:
-        batch_size: Number of cases to process per batch
+        batch_size: Number of cases to process (and commit) per batch
         
     Returns:
         Total number of chunks embedded
     """
-    total_chunks = 0
+    # Load once, before the stages share it. The chunk stage tokenizes with its own
+    # copy: the encode stage reconfigures truncation on the model's tokenizer per call,
+    # and a Rust tokenizer used from two threads fails with "Already borrowed"
+    chunk_tokenizer = copy.deepcopy(get_model().tokenizer)
+    stop = threading.Event()
+    chunked_q: queue.Queue = queue.Queue(maxsize=max(1, BACKFILL_QUEUE_SIZE))
+    embedded_q: queue.Queue = queue.Queue(maxsize=max(1, BACKFILL_QUEUE_SIZE))
+    
+    def fetch_and_chunk() -> None:
+        conn = psycopg2.connect(DATABASE_URL)
+        try:
+            for rows in _cases_missing_any_chunks(conn, batch_size=batch_size):
+                if stop.is_set():
+                    break
+                chunk_rows = []
+                for r in rows:
+                    # A single empty chunk for empty dockets so we don't repeatedly select them
+                    chunks = chunk_docket_text(r["docket_text"] or "", chunk_tokenizer) or [(0, "")]
+                    chunk_rows.extend((r["case_number"], cid, text) for cid, text in chunks)
+                chunked_q.put(chunk_rows)
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            chunked_q.put(None)
+            conn.close()
+    
+    def encode() -> None:
+        try:
+            while (chunk_rows := chunked_q.get()) is not None:
+                if stop.is_set():
+                    continue
+                # One encode call per batch; the (N, dim) float32 matrix travels to the writer as-is
+                embeds = embed_texts([text for _, _, text in chunk_rows])
+                embedded_q.put((chunk_rows, embeds))
+        except BaseException:
+            stop.set()
+            _drain(chunked_q)
+            raise
+        finally:
+            embedded_q.put(None)
+    
+    def write(conn) -> int:
+        written = 0
+        try:
+            while (batch := embedded_q.get()) is not None:
+                chunk_rows, embeds = batch
+                _upsert_chunks(conn, chunk_rows, embeds)
+                conn.commit()
+                written += len(chunk_rows)
+            return written
+        except BaseException:
+            stop.set()
+            _drain(embedded_q)
+            raise
+    
+    # The schema must exist before the producer queries case_chunk_embeddings
     conn = psycopg2.connect(DATABASE_URL)
     register_vector(conn)
     try:
         ensure_schema(conn, VECTOR_DIM)
+        with conn.cursor() as cur:
+            cur.execute(CHUNKS_STAGING_SQL)
+        conn.commit()
         
-        while True:
-            rows = _cases_missing_any_chunks(conn, limit=batch_size)
-            if not rows:
-                break
-            
-            for r in rows:
-                text = r["docket_text"] or ""
-                chunks = chunk_text(text, CHUNK_SIZE, CHUNK_OVERLAP)
-                
-                if not chunks:
-                    # Insert a single empty chunk so we don't repeatedly select it
-                    chunks = [(0, "")]
-                
-                embeds = embed_texts([c[1] for c in chunks])
-                _upsert_case_chunks(conn, r["case_number"], chunks, embeds)
-                total_chunks += len(chunks)
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="backfill") as pool:
+            stages = [pool.submit(fetch_and_chunk), pool.submit(encode)]
+            writer = pool.submit(write, conn)
+            total_chunks = writer.result()
+            for stage in stages:
+                stage.result()
     finally:
         conn.close()
     
     return total_chunks
 
-def search_dockets(query: str, top_k: int = 5) -> List[Dict]:
+# Nearest chunks first (ANN index scan on the embedding only), then best chunk per case,
+# then case metadata for the top_k cases that survive. With keywords, the candidates are
+# the keyword matches instead (GIN on tsv, capped and materialized), ranked exactly by
+# distance: filtering inside the ANN scan would only see hnsw.ef_search rows per partition.
+_SEARCH_SQL = """
+WITH q AS (SELECT {0}::{vtype} AS v),{keyword_matches}
+hits AS (
+  SELECT e.case_number, e.chunk_id, e.chunk_text, 1 - (e.embedding <=> q.v) AS similarity
+  FROM {candidates} e, q
+  ORDER BY e.embedding <=> q.v
+  LIMIT {2}
+),
+best AS (
+  SELECT DISTINCT ON (case_number) case_number, chunk_id, chunk_text, similarity
+  FROM hits
+  ORDER BY case_number, similarity DESC
+)
+SELECT
+  b.case_number,
+  b.chunk_id,
+  LEFT(b.chunk_text, {1}) AS snippet,
+  b.similarity,
+  c.title,
+  c.filed_date,
+  j.full_name AS judge,
+  co.name AS court
+FROM best b
+JOIN cases c        ON c.case_number = b.case_number
+LEFT JOIN judges j  ON j.id = c.judge_id
+LEFT JOIN courts co ON co.id = c.court_id
+ORDER BY b.similarity DESC
+LIMIT {3}
+"""
+_KEYWORD_MATCHES = """
+keyword_matches AS MATERIALIZED (
+  SELECT case_number, chunk_id, chunk_text, embedding
+  FROM case_chunk_embeddings
+  WHERE tsv @@ plainto_tsquery('english', {0})
+  LIMIT {cap}
+),"""
+
+@functools.lru_cache(maxsize=None)
+def search_sql(vtype: str, keywords: bool = False) -> str:
+    """
+    Search query for an embedding column of type vtype, with $n placeholders
+    (asyncpg prepares and caches it itself); keywords=True takes them as $5.
+    """
+    if keywords:
+        matches = _KEYWORD_MATCHES.format("$5", cap=max(1, KEYWORD_CANDIDATES))
+        return _SEARCH_SQL.format("$1", "$2", "$3", "$4", vtype=vtype,
+                                  keyword_matches=matches, candidates="keyword_matches")
+    return _SEARCH_SQL.format("$1", "$2", "$3", "$4", vtype=vtype,
+                              keyword_matches="", candidates="case_chunk_embeddings")
+
+# psycopg2 has no statement cache: pooled connections PREPARE the same queries once
+# per session (see _prepare_search) and search_dockets only sends EXECUTE. The query
+# vector is sent as a pgvector text literal, typed `vector` and cast to the column type in SQL.
+PREPARE_SEARCH_SQL = "PREPARE docket_search (vector, int, int, int) AS"
+PREPARE_SEARCH_KEYWORDS_SQL = "PREPARE docket_search_keywords (vector, int, int, int, text) AS"
+EXECUTE_SEARCH_SQL = "EXECUTE docket_search (%s, %s, %s, %s)"
+EXECUTE_SEARCH_KEYWORDS_SQL = "EXECUTE docket_search_keywords (%s, %s, %s, %s, %s)"
+
+# An HNSW scan returns at most hnsw.ef_search rows, so the hits CTE gets fewer than its
+# LIMIT candidates whenever that exceeds the session setting. Searches that need more
+# raise it for their own transaction only (is_local => reverts on commit/rollback).
+SET_EF_SEARCH_SQL = "SELECT set_config('hnsw.ef_search', %s, true);"
+SET_EF_SEARCH_ASYNC_SQL = "SELECT set_config('hnsw.ef_search', $1, true)"
+
+class _SearchConnection(psycopg2.extensions.connection):
+    """Pooled search connection; remembers whether the search statements are prepared"""
+    search_prepared = False
+
+def _prepare_search(conn: _SearchConnection) -> None:
+    """PREPARE the search statements on this session (prepared statements outlive transactions)"""
+    vtype = embedding_type()
+    with conn.cursor() as cur:
+        cur.execute(PREPARE_SEARCH_SQL + search_sql(vtype))
+        cur.execute(PREPARE_SEARCH_KEYWORDS_SQL + search_sql(vtype, keywords=True))
+    conn.commit()
+    conn.search_prepared = True
+
+def _candidate_chunks(top_k: int) -> int:
+    """ANN candidate chunks (hits LIMIT) fetched to find top_k distinct cases"""
+    return max(top_k * 10, 50)
+
+def _search_params(qvec, top_k: int, keywords: Optional[str] = None) -> Tuple:
+    """Search statement parameters: query vector, snippet length, ANN candidate chunks, cases[, keywords]"""
+    params = (qvec, TOP_SNIPPET_CHARS, _candidate_chunks(top_k), top_k)
+    return params + (keywords,) if keywords else params
+
+def _ef_search_override(top_k: int, keywords: Optional[str] = None) -> Optional[str]:
+    """
+    hnsw.ef_search this search needs on top of the session setting, or None.
+    
+    Keyword searches rank materialized matches exactly and never scan the index.
+    """
+    candidates = _candidate_chunks(top_k)
+    if keywords or candidates <= _hnsw_ef_search():
+        return None
+    return str(candidates)
+
+def _ivfflat_probes() -> int:
+    return int(os.environ.get('IVFFLAT_PROBES', 10))
+
+def _hnsw_ef_search() -> int:
+    return int(os.environ.get('HNSW_EF_SEARCH', 64))
+
+def search_server_settings() -> Dict[str, str]:
+    """Session settings for pooled search connections (set once at connect, survive pool resets)"""
+    return {
+        "hnsw.ef_search": str(_hnsw_ef_search()),
+        "ivfflat.probes": str(_ivfflat_probes()),
+    }
+
+def _case_results(case_rows: List[Dict]) -> List[Dict]:
+    """Shape search rows (one per case, ordered by best chunk similarity) for callers"""
+    return [
+        {
+            "case_number": r["case_number"],
+            "title": r["title"],
+            "filed_date": str(r["filed_date"]) if r["filed_date"] else None,
+            "judge": r["judge"],
+            "court": r["court"],
+            "best_similarity": round(float(r["similarity"]), 4),
+            "best_chunk_id": r["chunk_id"],
+            "best_chunk_snippet": r["snippet"],
+        }
+        for r in case_rows
+    ]
+
+def init() -> ThreadedConnectionPool:
+    """
+    One-time startup for search_dockets: ensure the schema and open the connection pool.
+    
+    Pooled connections get search_server_settings() as session settings at connect
+    and prepare the search statements on first use; the pgvector adapter is
+    registered process-wide. Safe to call more than once.
+    """
+    global _search_pool
+    if _search_pool is None:
+        options = " ".join(f"-c {name}={value}" for name, value in search_server_settings().items())
+        pool = ThreadedConnectionPool(
+            1, SEARCH_POOL_MAX, DATABASE_URL, options=options, connection_factory=_SearchConnection
+        )
+        conn = pool.getconn()
+        try:
+            ensure_schema(conn, VECTOR_DIM)
+            register_vector(conn, globally=True)
+        finally:
+            pool.putconn(conn)
+        _search_pool = pool
+    return _search_pool
+
+def search_dockets(query: str, top_k: int = 5, keywords: Optional[str] = None) -> List[Dict]:
     """
     Semantic search over docket_text using cosine similarity.
     
     Args:
         query: Natural language search query
         top_k: Number of cases to return
+        keywords: Optional keyword filter; only chunks matching plainto_tsquery(keywords) rank
         
     Returns:
         List of dicts with case metadata and best matching chunk
     """
     assert query and isinstance(query, str)
     
-    qvec = embed_texts([query])[0]  # unit-normalized
+    qvec = embed_query(query)  # unit-normalized float32
     
-    conn = psycopg2.connect(DATABASE_URL)
-    register_vector(conn)
+    # ef_search/probes are session settings of the pooled connections (see init)
+    pool = init()
+    conn = pool.getconn()
     try:
-        ensure_schema(conn, VECTOR_DIM)
-        
-        # Set ivfflat probes for better recall
-        with conn.cursor() as _c:
-            _c.execute("SET LOCAL ivfflat.probes = %s", (int(os.environ.get('IVFFLAT_PROBES', 10)),))
-        
-        # Retrieve top N chunks, then aggregate to top-k cases by best chunk similarity
+        if not conn.search_prepared:
+            _prepare_search(conn)
+        # Top N chunks, reduced to the top-k cases by best chunk similarity in SQL
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("""
-            WITH q AS (SELECT %s::vector AS v)
-            SELECT
-              e.case_number,
-              e.chunk_id,
-              LEFT(e.chunk_text, %s) AS snippet,
-              1 - (e.embedding <=> q.v) AS similarity,
-              c.title,
-              c.filed_date,
-              j.full_name AS judge,
-              co.name AS court
-            FROM case_chunk_embeddings e
-            JOIN cases c        ON c.case_number = e.case_number
-            LEFT JOIN judges j  ON j.id = c.judge_id
-            LEFT JOIN courts co ON co.id = c.court_id, q
-            ORDER BY e.embedding <=> q.v
-            LIMIT %s
-            """, (qvec, TOP_SNIPPET_CHARS, max(top_k * 10, 50)))
-            
-            chunk_rows = list(cur.fetchall())
+            sql = EXECUTE_SEARCH_KEYWORDS_SQL if keywords else EXECUTE_SEARCH_SQL
+            params = _search_params(qvec, top_k, keywords)
+            ef_search = _ef_search_override(top_k, keywords)
+            if ef_search is not None:
+                # Same round trip; rows come from the last statement, the rollback resets it
+                sql, params = SET_EF_SEARCH_SQL + sql, (ef_search,) + params
+            cur.execute(sql, params)
+            case_rows = list(cur.fetchall())
+        conn.rollback()
     finally:
-        conn.close()
+        pool.putconn(conn)
     
-    # Aggregate by case: take best chunk per case_number
-    best_by_case: Dict[str, Dict] = {}
-    for r in chunk_rows:
-        key = r["case_number"]
-        sim = float(r["similarity"])
+    return _case_results(case_rows)
+
+async def embed_query_async(query: str, executor: Optional[Executor] = None) -> np.ndarray:
+    """Embed a single query without blocking the event loop (encoding is CPU-bound)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, embed_query, query)
+
+async def search_dockets_async(query: str, top_k: int, pool, qvec: Optional[np.ndarray] = None,
+                               executor: Optional[Executor] = None,
+                               keywords: Optional[str] = None) -> List[Dict]:
+    """
+    Non-blocking variant of search_dockets for the API.
+    
+    Args:
+        query: Natural language search query
+        top_k: Number of cases to return
+        pool: asyncpg pool to run the vector query on; connections need the pgvector
+            codec registered and search_server_settings() applied (see api.py)
+        qvec: Precomputed query embedding (embedded here if omitted)
+        executor: Executor for the embedding call (loop default if omitted)
+        keywords: Optional keyword filter, as in search_dockets
         
-        if key not in best_by_case or sim > best_by_case[key]["best_similarity"]:
-            best_by_case[key] = {
-                "case_number": key,
-                "title": r["title"],
-                "filed_date": str(r["filed_date"]) if r["filed_date"] else None,
-                "judge": r["judge"],
-                "court": r["court"],
-                "best_similarity": round(sim, 4),
-                "best_chunk_id": r["chunk_id"],
-                "best_chunk_snippet": r["snippet"],
-            }
-    
-    # Sort by best_similarity desc and take top_k
-    results = sorted(best_by_case.values(), key=lambda x: x["best_similarity"], reverse=True)[:top_k]
-    return results
+    Returns:
+        Same shape as search_dockets
+    """
+    assert query and isinstance(query, str)
+    
+    if qvec is None:
+        qvec = await embed_query_async(query, executor)
+    
+    async with pool.acquire() as conn:
+        sql = search_sql(embedding_type(), keywords=bool(keywords))
+        params = _search_params(qvec, top_k, keywords)
+        ef_search = _ef_search_override(top_k, keywords)
+        if ef_search is None:
+            case_rows = await conn.fetch(sql, *params)
+        else:
+            async with conn.transaction():
+                await conn.execute(SET_EF_SEARCH_ASYNC_SQL, ef_search)
+                case_rows = await conn.fetch(sql, *params)
+    
+    return _case_results(case_rows)
 
 if __name__ == "__main__":
     import argparse
@@ -239,6 +706,7 @@ if __name__ == "__main__":
     p2 = sub.add_parser("search", help="Semantic search over docket_text")
     p2.add_argument("--q", required=True, help="Search query")
     p2.add_argument("--k", type=int, default=5, help="Number of results")
+    p2.add_argument("--keywords", help="Only rank chunks matching these keywords (full-text)")
     
     args = ap.parse_args()
     
@@ -246,7 +714,8 @@ if __name__ == "__main__":
         n = backfill_chunk_embeddings(batch_size=args.batch_size)
         print(json.dumps({"backfilled_chunks": n, "ts": datetime.utcnow().isoformat() + "Z"}, indent=2))
     elif args.cmd == "search":
-        out = search_dockets(args.q, args.k)
+        init()
+        out = search_dockets(args.q, args.k, args.keywords)
         print(json.dumps(out, indent=2, default=str))
     else:
         ap.print_help()
@@ -116,8 +116,9 @@ CREATE INDEX idx_cases_case_type_id ON cases(case_type_id);
 -- Status queries
 CREATE INDEX idx_cases_status ON cases(status);
 
--- Composite index for common query pattern: judge + year
-CREATE INDEX idx_cases_judge_date ON cases(judge_id, filed_date);
+-- Composite index for common query pattern: judge + year (GET /cases)
+-- Matches ORDER BY filed_date DESC and covers the listed columns for index-only scans
+CREATE INDEX idx_cases_judge_date ON cases(judge_id, filed_date DESC) INCLUDE (case_number, title, court_id);
 
 -- Composite index for common query pattern: court + case_type
 CREATE INDEX idx_cases_court_type ON cases(court_id, case_type_id);
@@ -192,9 +193,10 @@ CREATE TABLE IF NOT EXISTS ingest_runs (
 CREATE TABLE IF NOT EXISTS ingest_errors (
   error_id         BIGSERIAL PRIMARY KEY,
   run_id           BIGINT NOT NULL REFERENCES ingest_runs(run_id) ON DELETE CASCADE,
-  record_hash      TEXT,            -- sha256 of the raw record (for dedupe)
+  record_hash      TEXT,            -- blake3 of the raw record (for dedupe)
   case_number      TEXT,            -- optional for quick filtering
   error_code       TEXT NOT NULL,   -- e.g. BAD_DATE, STATUS_UNMAPPED, FK_CASE_TYPE
+  error_kind       SMALLINT,        -- numeric error_code (ingest.ERROR_KINDS), e.g. 1 = BAD_DATE
   error_message    TEXT,            -- short human-readable message
   details          JSONB,           -- { raw, normalized_attempt, context, why, suggestion }
   first_seen_at    TIMESTAMP NOT NULL DEFAULT now(),
@@ -207,6 +209,7 @@ CREATE TABLE IF NOT EXISTS ingest_errors (
 -- Helpful indexes for triage and dashboards
 CREATE INDEX IF NOT EXISTS idx_ingest_errors_run_id       ON ingest_errors (run_id);
 CREATE INDEX IF NOT EXISTS idx_ingest_errors_error_code   ON ingest_errors (error_code);
+CREATE INDEX IF NOT EXISTS idx_ingest_errors_kind_run     ON ingest_errors (error_kind, run_id);
 CREATE INDEX IF NOT EXISTS idx_ingest_errors_case_number  ON ingest_errors (case_number);
 CREATE INDEX IF NOT EXISTS idx_ingest_errors_resolved     ON ingest_errors (resolved);
 CREATE INDEX IF NOT EXISTS idx_ingest_errors_record_hash  ON ingest_errors (record_hash);
@@ -245,6 +248,27 @@ BEGIN
     END IF;
 END $$;
 
+-- Entity normalization stats for the data quality report (data_quality.py)
+-- COUNT(DISTINCT ...) over whole tables is materialized once per ingest run
+-- instead of on every report; ingest.py refreshes it after each run.
+-- Columns backed by a UNIQUE constraint (courts.name, *.normalized_name) are
+-- counted with plain COUNT(col): same result, no sort/hash de-duplication.
+CREATE MATERIALIZED VIEW IF NOT EXISTS entity_norm_stats AS
+    SELECT 'judges' AS entity,
+           COUNT(DISTINCT full_name) AS distinct_names,
+           COUNT(normalized_name) AS distinct_normalized,  -- u_judges_normalized_name
+           COUNT(*) AS total
+    FROM judges
+    UNION ALL
+    SELECT 'courts' AS entity,
+           COUNT(name) AS distinct_names,                  -- courts.name UNIQUE
+           COUNT(normalized_name) AS distinct_normalized,  -- u_courts_normalized_name
+           COUNT(*) AS total
+    FROM courts;
+
+-- Unique index required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_entity_norm_stats_entity ON entity_norm_stats (entity);
+
 -- Refresh collation version to fix version mismatches
 -- This ensures the database collation matches the current OS library version
 -- This is safe to run multiple times and will only refresh if needed
@@ -0,0 +1,96 @@
+"""
+Approximate (semantic) cache for /cases/search responses
+
+Users rephrase the same question, so lookups are keyed by the query embedding
+rather than the query string: a hit is any cached entry whose cosine similarity
+to the incoming embedding is >= threshold and whose exact-match key (e.g. the
+requested limit) is equal.
+
+Storage:
+- vectors: (capacity, dim) float32 matrix of unit-normalized embeddings
+- payloads: pre-serialized (orjson) response bytes, returned as-is on a hit
+- eviction: an insert first reuses the slot of an expired entry or of the same
+  query (same key, near-identical vector), else the least recently used slot;
+  entries older than ttl_seconds are ignored so new backfills show up eventually
+
+Lookup is one matrix-vector product over at most `capacity` rows (BLAS); at the
+default capacity (1024 x 384) that is cheaper than bucketing with LSH.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Hashable, List, Optional, Sequence
+
+import numpy as np
+
+
+class SemanticCache:
+    """In-process, embedding-keyed LRU cache of serialized responses"""
+
+    def __init__(self, dim: int, capacity: int = 1024, threshold: float = 0.95, ttl_seconds: float = 300.0):
+        self.dim = dim
+        self.capacity = max(1, capacity)
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+
+        self.vectors = np.zeros((self.capacity, dim), dtype=np.float32)
+        self.last_used = np.zeros(self.capacity, dtype=np.int64)
+        self.inserted_at = np.zeros(self.capacity, dtype=np.float64)
+        self.keys: List[Optional[Hashable]] = [None] * self.capacity
+        self.payloads: List[Optional[bytes]] = [None] * self.capacity
+        self.size = 0
+        self._tick = 0
+
+    def _normalize(self, vec: Sequence[float]) -> np.ndarray:
+        q = np.asarray(vec, dtype=np.float32).reshape(self.dim)
+        norm = float(np.linalg.norm(q))
+        return q / norm if norm > 0 else q
+
+    def lookup(self, vec: Sequence[float], key: Hashable = None) -> Optional[bytes]:
+        """Return the cached payload for a near-duplicate query, or None on a miss"""
+        if self.size == 0:
+            return None
+
+        q = self._normalize(vec)
+        sims = self.vectors[:self.size] @ q
+        sims[self.inserted_at[:self.size] < time.monotonic() - self.ttl_seconds] = -np.inf
+
+        # Best candidates first; the exact-match key check is cheap and usually hits on the first
+        candidates = np.flatnonzero(sims >= self.threshold)
+        for i in candidates[np.argsort(-sims[candidates])]:
+            if self.keys[i] == key:
+                self._tick += 1
+                self.last_used[i] = self._tick
+                return self.payloads[i]
+        return None
+
+    # Cosine similarity above which an insert replaces an entry with the same key
+    DUPLICATE_SIMILARITY = 0.9999
+
+    def _slot_for(self, q: np.ndarray, key: Hashable) -> int:
+        """Slot to overwrite: same query, else expired, else free, else least recently used"""
+        if self.size:
+            sims = self.vectors[:self.size] @ q
+            for i in np.flatnonzero(sims >= self.DUPLICATE_SIMILARITY):
+                if self.keys[i] == key:
+                    return int(i)
+            expired = np.flatnonzero(self.inserted_at[:self.size] < time.monotonic() - self.ttl_seconds)
+            if expired.size:
+                return int(expired[0])
+        if self.size < self.capacity:
+            self.size += 1
+            return self.size - 1
+        return int(np.argmin(self.last_used))
+
+    def insert(self, vec: Sequence[float], payload: bytes, key: Hashable = None) -> None:
+        """Store a payload, reusing a stale or duplicate slot, else evicting the least recently used entry"""
+        q = self._normalize(vec)
+        i = self._slot_for(q, key)
+
+        self._tick += 1
+        self.vectors[i] = q
+        self.last_used[i] = self._tick
+        self.inserted_at[i] = time.monotonic()
+        self.keys[i] = key
+        self.payloads[i] = payload